@@ -1,404 +1,439 @@
 #!/usr/bin/env python3
 """Find large GitHub organizations ranked by public member count."""
 
+import json
+import os
+import re
+import sqlite3
 import subprocess
 import sys
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
-# Seed list of suspected large organizations
-CANDIDATE_ORGS = [
-    # Tech companies - major
-    "microsoft",
-    "google",
-    "facebook",
-    "meta",
-    "amazon",
-    "apple",
-    "netflix",
-    "twitter",
-    "x",
-    "uber",
-    "airbnb",
-    "linkedin",
-    "spotify",
-    "stripe",
-    "shopify",
-    "salesforce",
-    "oracle",
-    "ibm",
-    "intel",
-    "nvidia",
-    "amd",
-    "redhat",
-    "vmware",
-    "cisco",
-    "adobe",
-    "autodesk",
-    "atlassian",
-    "jetbrains",
-    "mozilla",
-    "brave",
-    "vercel",
-    "netlify",
-    "cloudflare",
-    "digitalocean",
-    "heroku",
-    "twilio",
-    "datadog",
-    "elastic",
-    "mongodb",
-    "hashicorp",
-    "confluent",
-    "databricks",
-    "snowflake",
-    "palantir",
-    "pinterest",
-    "dropbox",
-    "slack",
-    "zoom",
-    "okta",
-    "splunk",
-    "newrelic",
-    "pagerduty",
-    "grafana",
-    "sentry-io",
-    "snyk",
-    # Tech companies - more
-    "square",
-    "block",
-    "paypal",
-    "coinbase",
-    "robinhood",
-    "plaid",
-    "postman",
-    "kong",
-    "redislabs",
-    "timescale",
-    "influxdata",
-    "planetscale",
-    "supabase",
-    "appwrite",
-    "hasura",
-    "prisma",
-    "auth0",
-    "temporal-io",
-    # Open source foundations & communities
-    "apache",
-    "linux",
-    "linuxfoundation",
-    "cncf",
-    "kubernetes",
-    "docker",
-    "openstack",
-    "eclipse",
-    "gnome",
-    "kde",
-    "freedesktop",
-    "w3c",
-    "whatwg",
-    "tc39",
-    "nodejs",
-    "denoland",
-    "rust-lang",
-    "golang",
-    "python",
-    "ruby",
-    "php",
-    "dotnet",
-    "openjdk",
-    "swift",
-    "kotlin",
-    "flutter",
-    "reactjs",
-    "vuejs",
-    "angular",
-    "sveltejs",
-    "emberjs",
-    "django",
-    "rails",
-    "laravel",
-    "spring-projects",
-    "quarkusio",
-    "openjs-foundation",
-    "jquery",
-    "expressjs",
-    "nestjs",
-    "fastify",
-    # More languages & runtimes
-    "elixir-lang",
-    "erlang",
-    "haskell",
-    "ocaml",
-    "clojure",
-    "scala",
-    "crystal-lang",
-    "nim-lang",
-    "zig",
-    "vlang",
-    # Cloud & infrastructure
-    "aws",
-    "azure",
-    "googlecloudplatform",
-    "terraform-providers",
-    "pulumi",
-    "ansible",
-    "puppet",
-    "chef",
-    "jenkinsci",
-    "circleci",
-    "github",
-    "gitlab",
-    "gitea",
-    "sourcegraph",
-    "argoproj",
-    "fluxcd",
-    "tektoncd",
-    "crossplane",
-    "istio",
-    "envoyproxy",
-    "traefik",
-    "nginx",
-    "containerd",
-    "containers",
-    "rancher",
-    "prometheus-community",
-    "thanos-io",
-    "grafana",
-    "open-telemetry",
-    "jaegertracing",
-    "fluentd",
-    # Data & ML
-    "tensorflow",
-    "pytorch",
-    "keras-team",
-    "scikit-learn",
-    "pandas-dev",
-    "numpy",
-    "scipy",
-    "jupyter",
-    "huggingface",
-    "openai",
-    "langchain-ai",
-    "mlflow",
-    "dbt-labs",
-    "airbyte",
-    "apache-airflow",
-    "dagster-io",
-    "streamlit",
-    "plotly",
-    "dask",
-    "polars",
-    # Databases
-    "postgres",
-    "postgresql",
-    "mysql",
-    "mariadb",
-    "cockroachdb",
-    "yugabyte",
-    "redis",
-    "scylladb",
-    "neo4j",
-    "arangodb",
-    "dgraph-io",
-    "couchbase",
-    "duckdb",
-    "sqlite",
-    # Security
-    "owasp",
-    "aquasecurity",
-    "falcosecurity",
-    "sigstore",
-    # Gaming
-    "unity-technologies",
-    "godotengine",
-    "epicgames",
-    "valvesoftware",
-    "bevyengine",
-    "libgdx",
-    "raylib",
-    # Blockchain
-    "ethereum",
-    "bitcoin",
-    "solana-labs",
-    "cosmos",
-    "polkadot",
-    "near",
-    "aptos-labs",
-    "chainlink",
-    "uniswap",
-    "openzeppelin",
-    # Media & design
-    "gimp",
-    "inkscape",
-    "blender",
-    "darktable",
-    "obs-project",
-    "audacity",
-    "musescore",
-    # Universities & research
-    "stanford",
-    "mit",
-    "berkeley",
-    "cmu",
-    "harvard",
-    "princeton",
-    "caltech",
-    "gatech",
-    "uiuc",
-    "deepmind",
-    "google-research",
-    "facebookresearch",
-    # Other large communities
-    "home-assistant",
-    "freecodecamp",
-    "exercism",
-    "mdn",
-    "discourse",
-    "matrix-org",
-    "forem",
-    "signal",
-    "element-hq",
-    "wordpress",
-    "drupal",
-    "magento",
-    "ghost",
-    "strapi",
-    "directus",
-    "sanity-io",
-    # Package managers & build tools
-    "npm",
-    "yarnpkg",
-    "pnpm",
-    "pypa",
-    "rubygems",
-    "gradle",
-    "maven",
-    "bazel",
-    "cmake",
-    "webpack",
-    "rollup",
-    "esbuild",
-    "swc",
-    "turbo",
-    "nx",
-    # Testing
-    "selenium",
-    "cypress-io",
-    "playwright",
-    "puppeteer",
-    "jest",
-    "vitest",
-    "pytest-dev",
-    "junit-team",
-    "testing-library",
-    "storybook",
-    # CLI & terminal
-    "charmbracelet",
-    "alacritty",
-    "ohmyzsh",
-    "fish-shell",
-    "nushell",
-    # Editors & IDEs
-    "neovim",
-    "vim",
-    "vscode",
-    "gitpod",
-    "helix-editor",
-    "zed-industries",
-    # DevOps & SRE
-    "kubernetes-sigs",
-    "operator-framework",
-    "helm",
-    "kustomize",
-    "terraform",
-    "terragrunt",
-    "ansible-collections",
-    "packer",
-    "vagrant",
-    "nomad",
-    # China tech
-    "alibaba",
-    "aliyun",
-    "tencentcloud",
-    "tencent",
-    "baidu",
-    "bytedance",
-    "didi",
-    "meituan",
-    "jd",
-    "xiaomi",
-    "huawei",
-    "ant-design",
-    "element-plus",
-    "vant-ui",
-    # India tech
-    "razorpay",
-    "zerodha",
-    "flipkart",
-    "swiggy",
-    "zomato",
-    # Europe tech
-    "klarna",
-    "adyen",
-    "deliveroo",
-    "transferwise",
-    "wise",
-    "contentful",
-    "celonis",
-    "uipath",
-    # Japan tech
-    "line",
-    "mercari",
-    "cyberagent",
-    "rakuten",
-    "yahoo-japan",
-    # More orgs that might be large
-    "SAP",
-    "sap",
-    "siemens",
-    "bosch",
-    "philips",
-    "sony",
-    "samsung",
-    "lg",
-    "htc",
-    "motorola",
-    "lenovo",
-    "dell",
-    "hp",
-    "accenture",
-    "infosys",
-    "tcs",
-    "wipro",
-    "cognizant",
-    "redhat-developer",
-    "ibm-cloud",
-    "oracle-devrel",
-    "awslabs",
-    "aws-samples",
-    "azure-samples",
-    "GoogleCloudPlatform",
-    "actions",
-    "cli",
-    "desktop",
-    "electron",
-    "atom",
-    "vercel-community",
-    "prisma-community",
-]
+# Member counts move slowly, so reuse results from recent runs
+CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "gh-activity-chronicle"
+    / "org_counts.sqlite"
+)
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Lookups are network-bound, so run many at once; the REST rate limit,
+# not the thread count, is the real ceiling
+MAX_WORKERS = 50
+
+# Page number of the rel="last" entry in a paginated response's Link header
+LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# Seed set of suspected large organizations (lowercase, as GitHub logins
+# are case-insensitive)
+CANDIDATE_ORGS = frozenset(
+    {
+        # Tech companies - major
+        "microsoft",
+        "google",
+        "facebook",
+        "meta",
+        "amazon",
+        "apple",
+        "netflix",
+        "twitter",
+        "x",
+        "uber",
+        "airbnb",
+        "linkedin",
+        "spotify",
+        "stripe",
+        "shopify",
+        "salesforce",
+        "oracle",
+        "ibm",
+        "intel",
+        "nvidia",
+        "amd",
+        "redhat",
+        "vmware",
+        "cisco",
+        "adobe",
+        "autodesk",
+        "atlassian",
+        "jetbrains",
+        "mozilla",
+        "brave",
+        "vercel",
+        "netlify",
+        "cloudflare",
+        "digitalocean",
+        "heroku",
+        "twilio",
+        "datadog",
+        "elastic",
+        "mongodb",
+        "hashicorp",
+        "confluent",
+        "databricks",
+        "snowflake",
+        "palantir",
+        "pinterest",
+        "dropbox",
+        "slack",
+        "zoom",
+        "okta",
+        "splunk",
+        "newrelic",
+        "pagerduty",
+        "grafana",
+        "sentry-io",
+        "snyk",
+        # Tech companies - more
+        "square",
+        "block",
+        "paypal",
+        "coinbase",
+        "robinhood",
+        "plaid",
+        "postman",
+        "kong",
+        "redislabs",
+        "timescale",
+        "influxdata",
+        "planetscale",
+        "supabase",
+        "appwrite",
+        "hasura",
+        "prisma",
+        "auth0",
+        "temporal-io",
+        # Open source foundations & communities
+        "apache",
+        "linux",
+        "linuxfoundation",
+        "cncf",
+        "kubernetes",
+        "docker",
+        "openstack",
+        "eclipse",
+        "gnome",
+        "kde",
+        "freedesktop",
+        "w3c",
+        "whatwg",
+        "tc39",
+        "nodejs",
+        "denoland",
+        "rust-lang",
+        "golang",
+        "python",
+        "ruby",
+        "php",
+        "dotnet",
+        "openjdk",
+        "swift",
+        "kotlin",
+        "flutter",
+        "reactjs",
+        "vuejs",
+        "angular",
+        "sveltejs",
+        "emberjs",
+        "django",
+        "rails",
+        "laravel",
+        "spring-projects",
+        "quarkusio",
+        "openjs-foundation",
+        "jquery",
+        "expressjs",
+        "nestjs",
+        "fastify",
+        # More languages & runtimes
+        "elixir-lang",
+        "erlang",
+        "haskell",
+        "ocaml",
+        "clojure",
+        "scala",
+        "crystal-lang",
+        "nim-lang",
+        "zig",
+        "vlang",
+        # Cloud & infrastructure
+        "aws",
+        "azure",
+        "googlecloudplatform",
+        "terraform-providers",
+        "pulumi",
+        "ansible",
+        "puppet",
+        "chef",
+        "jenkinsci",
+        "circleci",
+        "github",
+        "gitlab",
+        "gitea",
+        "sourcegraph",
+        "argoproj",
+        "fluxcd",
+        "tektoncd",
+        "crossplane",
+        "istio",
+        "envoyproxy",
+        "traefik",
+        "nginx",
+        "containerd",
+        "containers",
+        "rancher",
+        "prometheus-community",
+        "thanos-io",
+        "open-telemetry",
+        "jaegertracing",
+        "fluentd",
+        # Data & ML
+        "tensorflow",
+        "pytorch",
+        "keras-team",
+        "scikit-learn",
+        "pandas-dev",
+        "numpy",
+        "scipy",
+        "jupyter",
+        "huggingface",
+        "openai",
+        "langchain-ai",
+        "mlflow",
+        "dbt-labs",
+        "airbyte",
+        "apache-airflow",
+        "dagster-io",
+        "streamlit",
+        "plotly",
+        "dask",
+        "polars",
+        # Databases
+        "postgres",
+        "postgresql",
+        "mysql",
+        "mariadb",
+        "cockroachdb",
+        "yugabyte",
+        "redis",
+        "scylladb",
+        "neo4j",
+        "arangodb",
+        "dgraph-io",
+        "couchbase",
+        "duckdb",
+        "sqlite",
+        # Security
+        "owasp",
+        "aquasecurity",
+        "falcosecurity",
+        "sigstore",
+        # Gaming
+        "unity-technologies",
+        "godotengine",
+        "epicgames",
+        "valvesoftware",
+        "bevyengine",
+        "libgdx",
+        "raylib",
+        # Blockchain
+        "ethereum",
+        "bitcoin",
+        "solana-labs",
+        "cosmos",
+        "polkadot",
+        "near",
+        "aptos-labs",
+        "chainlink",
+        "uniswap",
+        "openzeppelin",
+        # Media & design
+        "gimp",
+        "inkscape",
+        "blender",
+        "darktable",
+        "obs-project",
+        "audacity",
+        "musescore",
+        # Universities & research
+        "stanford",
+        "mit",
+        "berkeley",
+        "cmu",
+        "harvard",
+        "princeton",
+        "caltech",
+        "gatech",
+        "uiuc",
+        "deepmind",
+        "google-research",
+        "facebookresearch",
+        # Other large communities
+        "home-assistant",
+        "freecodecamp",
+        "exercism",
+        "mdn",
+        "discourse",
+        "matrix-org",
+        "forem",
+        "signal",
+        "element-hq",
+        "wordpress",
+        "drupal",
+        "magento",
+        "ghost",
+        "strapi",
+        "directus",
+        "sanity-io",
+        # Package managers & build tools
+        "npm",
+        "yarnpkg",
+        "pnpm",
+        "pypa",
+        "rubygems",
+        "gradle",
+        "maven",
+        "bazel",
+        "cmake",
+        "webpack",
+        "rollup",
+        "esbuild",
+        "swc",
+        "turbo",
+        "nx",
+        # Testing
+        "selenium",
+        "cypress-io",
+        "playwright",
+        "puppeteer",
+        "jest",
+        "vitest",
+        "pytest-dev",
+        "junit-team",
+        "testing-library",
+        "storybook",
+        # CLI & terminal
+        "charmbracelet",
+        "alacritty",
+        "ohmyzsh",
+        "fish-shell",
+        "nushell",
+        # Editors & IDEs
+        "neovim",
+        "vim",
+        "vscode",
+        "gitpod",
+        "helix-editor",
+        "zed-industries",
+        # DevOps & SRE
+        "kubernetes-sigs",
+        "operator-framework",
+        "helm",
+        "kustomize",
+        "terraform",
+        "terragrunt",
+        "ansible-collections",
+        "packer",
+        "vagrant",
+        "nomad",
+        # China tech
+        "alibaba",
+        "aliyun",
+        "tencentcloud",
+        "tencent",
+        "baidu",
+        "bytedance",
+        "didi",
+        "meituan",
+        "jd",
+        "xiaomi",
+        "huawei",
+        "ant-design",
+        "element-plus",
+        "vant-ui",
+        # India tech
+        "razorpay",
+        "zerodha",
+        "flipkart",
+        "swiggy",
+        "zomato",
+        # Europe tech
+        "klarna",
+        "adyen",
+        "deliveroo",
+        "transferwise",
+        "wise",
+        "contentful",
+        "celonis",
+        "uipath",
+        # Japan tech
+        "line",
+        "mercari",
+        "cyberagent",
+        "rakuten",
+        "yahoo-japan",
+        # More orgs that might be large
+        "sap",
+        "siemens",
+        "bosch",
+        "philips",
+        "sony",
+        "samsung",
+        "lg",
+        "htc",
+        "motorola",
+        "lenovo",
+        "dell",
+        "hp",
+        "accenture",
+        "infosys",
+        "tcs",
+        "wipro",
+        "cognizant",
+        "redhat-developer",
+        "ibm-cloud",
+        "oracle-devrel",
+        "awslabs",
+        "aws-samples",
+        "azure-samples",
+        "actions",
+        "cli",
+        "desktop",
+        "electron",
+        "atom",
+        "vercel-community",
+        "prisma-community",
+    }
+)
+
+
+def parse_link_last(headers):
+    """Return the last page number from a Link header, or None."""
+    match = LAST_PAGE_RE.search(headers or "")
+    return int(match.group(1)) if match else None
 
 
 def get_public_member_count(org):
-    """Get the public member count for an organization."""
+    """Get the public member count for an organization.
+
+    Requests one member per page, so the page number in the ``rel="last"``
+    Link header equals the member count. That needs a single API call per
+    org regardless of its size, rather than walking every page.
+
+    GraphQL's ``membersWithRole { totalCount }`` would allow batching many
+    orgs per request, but it also counts concealed members whenever the
+    authenticated user belongs to the org, so it can't be used for a
+    public-member ranking.
+    """
     try:
         result = subprocess.run(
             [
                 "gh",
                 "api",
-                f"/orgs/{org}/public_members",
-                "--paginate",
-                "-q",
-                "length",
+                "--include",
+                f"/orgs/{org}/public_members?per_page=1",
             ],
             capture_output=True,
             text=True,
@@ -407,10 +442,15 @@ def get_public_member_count(org):
         if result.returncode != 0:
             return org, 0, result.stderr.strip()
 
-        total = sum(
-            int(line) for line in result.stdout.strip().split("\n") if line
+        headers, _, body = result.stdout.replace("\r\n", "\n").partition(
+            "\n\n"
         )
-        return org, total, None
+        last_page = parse_link_last(headers)
+        if last_page is not None:
+            return org, last_page, None
+
+        # No Link header: zero or one member, all on the first page
+        return org, len(json.loads(body or "[]")), None
 
     except subprocess.TimeoutExpired:
         return org, 0, "timeout"
@@ -418,70 +458,139 @@ def get_public_member_count(org):
         return org, 0, str(e)
 
 
+def get_rate_limit_remaining():
+    """Return remaining core REST API calls, or None if unknown."""
+    try:
+        result = subprocess.run(
+            ["gh", "api", "rate_limit", "-q", ".resources.core.remaining"],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        return int(result.stdout.strip())
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
+
+
+def open_count_cache():
+    """Open (creating if needed) the on-disk member count cache."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(CACHE_PATH))
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS org_counts"
+        " (org TEXT PRIMARY KEY, count INTEGER, fetched_at INTEGER)"
+    )
+    return conn
+
+
+def load_fresh_counts(conn, now):
+    """Return {org: count} for cache entries younger than the TTL."""
+    rows = conn.execute(
+        "SELECT org, count FROM org_counts WHERE fetched_at > ?",
+        (now - CACHE_TTL_SECONDS,),
+    )
+    return dict(rows)
+
+
+def save_counts(conn, results, now):
+    """Store freshly fetched (org, count) pairs in one transaction."""
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO org_counts (org, count, fetched_at)"
+            " VALUES (?, ?, ?)",
+            [(org, count, now) for org, count in results],
+        )
+
+
+def format_rows(ranked_orgs, first_rank):
+    """Format (org, count) pairs as ranked table lines."""
+    rows = []
+    for rank, (org, count) in enumerate(ranked_orgs, first_rank):
+        members = format(count, ",")
+        rows.append(f"{rank:<6} {org:<30} {members:>15}\n")
+    return rows
+
+
 def main():
-    # Dedupe the list (case-insensitive)
-    seen = set()
-    unique_orgs = []
-    for org in CANDIDATE_ORGS:
-        lower = org.lower()
-        if lower not in seen:
-            seen.add(lower)
-            unique_orgs.append(org)
+    unique_orgs = sorted(CANDIDATE_ORGS)
+
+    now = int(time.time())
+    conn = open_count_cache()
+    cached = load_fresh_counts(conn, now)
+    results = [(org, cached[org]) for org in unique_orgs if org in cached]
+    stale_orgs = [org for org in unique_orgs if org not in cached]
+
+    # One call per org; stay within what the rate limit still allows
+    remaining = get_rate_limit_remaining()
+    if remaining is not None and remaining < len(stale_orgs):
+        print(
+            f"Only {remaining} API calls left in this rate-limit window;"
+            f" skipping {len(stale_orgs) - remaining} orgs (run again later)"
+        )
+        stale_orgs = stale_orgs[:remaining]
 
     print(
-        f"Querying public member counts for {len(unique_orgs)}"
-        " candidate organizations..."
+        f"Querying public member counts for {len(stale_orgs)}"
+        f" candidate organizations ({len(results)} cached)..."
     )
     print("(This may take a few minutes)\n")
 
-    results = []
+    fetched = []
     errors = []
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
+    workers = max(1, min(len(stale_orgs), MAX_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
         futures = {
             executor.submit(get_public_member_count, org): org
-            for org in unique_orgs
+            for org in stale_orgs
         }
 
         completed = 0
+        total = len(stale_orgs)
         for future in as_completed(futures):
             completed += 1
             org, count, error = future.result()
             if error:
                 errors.append((org, error))
             else:
-                results.append((org, count))
+                fetched.append((org, count))
 
-            sys.stdout.write(
-                f"\rProcessed {completed}/{len(unique_orgs)} orgs"
-            )
-            sys.stdout.flush()
+            # Redrawing the progress line on every org is just flush churn
+            if completed % 10 == 0 or completed == total:
+                sys.stdout.write(f"\rProcessed {completed}/{total} orgs")
+                sys.stdout.flush()
 
     print("\n")
 
+    save_counts(conn, fetched, now)
+    conn.close()
+    results.extend(fetched)
+
     # Sort by member count descending
     results.sort(key=lambda x: x[1], reverse=True)
 
     # Show orgs with 100+ members
     large_orgs = [(org, count) for org, count in results if count >= 100]
 
-    print("=== Organizations with 100+ public members ===\n")
-    print(f"{'Rank':<6} {'Organization':<30} {'Public Members':>15}")
-    print("-" * 55)
-
-    for i, (org, count) in enumerate(large_orgs, 1):
-        print(f"{i:<6} {org:<30} {count:>15,}")
-
-    print(f"\nFound {len(large_orgs)} organizations with 100+ public members")
+    table_header = [
+        f"{'Rank':<6} {'Organization':<30} {'Public Members':>15}\n",
+        "-" * 55 + "\n",
+    ]
+    out = ["=== Organizations with 100+ public members ===\n\n"]
+    out.extend(table_header)
+    out.extend(format_rows(large_orgs, 1))
+    out.append(
+        f"\nFound {len(large_orgs)} organizations with 100+ public members\n"
+    )
 
     # Also show next tier (50-99)
     mid_orgs = [(org, count) for org, count in results if 50 <= count < 100]
     if mid_orgs:
-        print("\n\n=== Organizations with 50-99 public members ===\n")
-        print(f"{'Rank':<6} {'Organization':<30} {'Public Members':>15}")
-        print("-" * 55)
-        for i, (org, count) in enumerate(mid_orgs, len(large_orgs) + 1):
-            print(f"{i:<6} {org:<30} {count:>15,}")
+        out.append("\n\n=== Organizations with 50-99 public members ===\n\n")
+        out.extend(table_header)
+        out.extend(format_rows(mid_orgs, len(large_orgs) + 1))
+
+    sys.stdout.write("".join(out))
 
 
 if __name__ == "__main__":
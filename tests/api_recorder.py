@@ -20,6 +20,7 @@ Usage for replay:
 import hashlib
 import json
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List
@@ -27,21 +28,37 @@ from unittest.mock import patch
 
 
 class ApiRecorder:
-    """Records API calls and responses to fixture files."""
+    """Records API calls and responses to fixture files.
 
-    def __init__(self, output_dir: str):
+    Fixtures are written as compact JSON; pass ``pretty=True`` to indent
+    them for hand inspection.
+    """
+
+    def __init__(self, output_dir: str, pretty: bool = False):
         self.output_dir = Path(output_dir)
+        self.indent = 2 if pretty else None
         self.manifest: List[Dict[str, Any]] = []
         self.call_count = 0
         self._original_run = None
+        self._writer_pool = None
+        self._pending_writes = []
+        self._response_files: Dict[str, str] = {}
 
     def _make_call_id(self, args: List[str]) -> str:
         """Create a unique ID for an API call based on arguments."""
-        # Create a hash of the arguments for uniqueness
-        args_str = json.dumps(args, sort_keys=True)
-        hash_suffix = hashlib.md5(args_str.encode()).hexdigest()[:8]
+        # gh args are a flat list of strings, so NUL-joining them is an
+        # unambiguous key; no need to JSON-encode before hashing
+        args_bytes = "\x00".join(args).encode()
+        hash_suffix = hashlib.blake2b(args_bytes, digest_size=4).hexdigest()
         return f"{self.call_count:03d}_{hash_suffix}"
 
+    def _write_response(self, response_file: str, response_data: Dict):
+        """Serialize one response to disk (runs on the writer pool)."""
+        (self.output_dir / response_file).write_text(
+            json.dumps(response_data, indent=self.indent, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
     def _recording_wrapper(self, args, **kwargs):
         """Wrapper that records subprocess calls."""
         # Only record 'gh' commands
@@ -52,29 +69,43 @@ class ApiRecorder:
             # Make the actual call
             result = self._original_run(args, **kwargs)
 
-            # Record the call and response
-            response_file = f"{call_id}.json"
-            record = {
-                "call_id": call_id,
-                "args": args,
-                "response_file": response_file,
+            response_data = {
+                "stdout": result.stdout,
+                "stderr": result.stderr or "",
                 "returncode": result.returncode,
             }
 
-            # Save response content
-            self.output_dir.mkdir(parents=True, exist_ok=True)
-            response_path = self.output_dir / response_file
+            # Identical responses (the same query issued from several
+            # code paths) share one file; retries that got a different
+            # answer still get their own
+            content_key = hashlib.blake2b(
+                "\x00".join(
+                    (
+                        str(result.returncode),
+                        result.stdout or "",
+                        response_data["stderr"],
+                    )
+                ).encode(),
+                digest_size=16,
+            ).hexdigest()
+            response_file = self._response_files.get(content_key)
+            if response_file is None:
+                response_file = f"{call_id}.json"
+                self._response_files[content_key] = response_file
 
-            response_data = {
-                "stdout": result.stdout,
-                "stderr": result.stderr if hasattr(result, "stderr") else "",
+                # Write in the background so the next gh call isn't held up
+                self._pending_writes.append(
+                    self._writer_pool.submit(
+                        self._write_response, response_file, response_data
+                    )
+                )
+
+            record = {
+                "call_id": call_id,
+                "args": args,
+                "response_file": response_file,
                 "returncode": result.returncode,
             }
-            response_path.write_text(
-                json.dumps(response_data, indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
-
             self.manifest.append(record)
             return result
         else:
@@ -86,16 +117,27 @@ class ApiRecorder:
         self._original_run = subprocess.run
         self.manifest = []
         self.call_count = 0
+        self._writer_pool = ThreadPoolExecutor(max_workers=2)
+        self._pending_writes = []
+        self._response_files = {}
+        # Created once here rather than on every recorded call
+        self.output_dir.mkdir(parents=True, exist_ok=True)
 
         try:
             with patch("subprocess.run", side_effect=self._recording_wrapper):
                 yield self
         finally:
+            # Let pending response writes finish (surfacing any write
+            # error) before the manifest that points at them is saved
+            self._writer_pool.shutdown(wait=True)
+            for future in self._pending_writes:
+                future.result()
+
             # Save manifest
-            self.output_dir.mkdir(parents=True, exist_ok=True)
             manifest_path = self.output_dir / "manifest.json"
             manifest_path.write_text(
-                json.dumps(self.manifest, indent=2), encoding="utf-8"
+                json.dumps(self.manifest, indent=self.indent),
+                encoding="utf-8",
             )
 
 
@@ -109,7 +151,7 @@ class ApiReplayer:
         self._responses: Dict[str, Dict] = {}
 
     def _load_fixtures(self):
-        """Load manifest and response files."""
+        """Load the manifest; response files are read on first use."""
         manifest_path = self.fixture_dir / "manifest.json"
         if not manifest_path.exists():
             raise FileNotFoundError(
@@ -119,13 +161,24 @@ class ApiReplayer:
 
         self.manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
 
-        # Pre-load all response files
-        for record in self.manifest:
+    def _get_response(self, record: Dict[str, Any]) -> Dict:
+        """Return the recorded response for a manifest entry.
+
+        Each response file is parsed only when a replayed call needs it,
+        then kept for any later replay of the same call.
+        """
+        call_id = record["call_id"]
+        response_data = self._responses.get(call_id)
+        if response_data is None:
             response_path = self.fixture_dir / record["response_file"]
             if response_path.exists():
-                self._responses[record["call_id"]] = json.loads(
+                response_data = json.loads(
                     response_path.read_text(encoding="utf-8")
                 )
+            else:
+                response_data = {}
+            self._responses[call_id] = response_data
+        return response_data
 
     def _make_mock_result(
         self, response_data: Dict
@@ -154,8 +207,7 @@ class ApiReplayer:
 
             # Verify the call matches (optional, can be relaxed)
             # For now, just return the recorded response in order
-            response_data = self._responses.get(record["call_id"], {})
-            return self._make_mock_result(response_data)
+            return self._make_mock_result(self._get_response(record))
         else:
             # For non-gh commands, actually run them
             return subprocess.run(args, **kwargs)
@@ -1,5 +1,6 @@
 """Shared pytest fixtures and configuration for gh-activity-chronicle tests."""
 
+import functools
 import importlib.machinery
 import importlib.util
 import sys
@@ -8,6 +9,12 @@ from unittest.mock import patch
 
 import pytest
 
+# Make the repo root importable (for "from tests... import ...") once for
+# the whole session, rather than from each test module
+_REPO_ROOT = str(Path(__file__).parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
 
 def pytest_addoption(parser):
     """Add custom command line options."""
@@ -24,8 +31,15 @@ def pytest_addoption(parser):
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=None)
 def load_chronicle_module():
-    """Load gh-activity-chronicle as a module despite lacking .py extension."""
+    """Load gh-activity-chronicle as a module despite lacking .py extension.
+
+    The result is cached, so every test file that calls this shares one
+    module object instead of re-executing the script. Bytecode is already
+    cached on disk by SourceFileLoader (in ``__pycache__``, keyed on the
+    script's mtime), so only the first call per process pays for exec.
+    """
     script_path = Path(__file__).parent.parent / "gh-activity-chronicle"
 
     # Use machinery.SourceFileLoader for broader Python version compatibility
@@ -50,7 +64,7 @@ def load_chronicle_module():
 chronicle = load_chronicle_module()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mod():
     """Provide access to the chronicle module."""
     return chronicle
@@ -58,10 +72,13 @@ def mod():
 
 # ---------------------------------------------------------------------------
 # Sample data fixtures
+#
+# Module-scoped: built once per test file and shared, so tests must treat
+# them as read-only (copy before mutating).
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_pr_nodes():
     """Sample PR data for testing PR table generation."""
     return [
@@ -101,7 +118,7 @@ def sample_pr_nodes():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_repos_by_category():
     """Sample categorized repos for testing aggregation."""
     return {
@@ -142,7 +159,7 @@ def sample_repos_by_category():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_repo_line_stats():
     """Sample line stats by repo."""
     return {
@@ -153,7 +170,7 @@ def sample_repo_line_stats():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_member_data():
     """Sample member data for testing org aggregation.
 
@@ -261,6 +278,25 @@ def sample_member_data():
     ]
 
 
+@pytest.fixture(scope="module")
+def twenty_prs():
+    """Twenty PRs with strictly decreasing size, for notable-PR limits."""
+    return [
+        {
+            "title": f"PR {i}",
+            "url": f"https://github.com/owner/repo/pull/{i}",
+            "state": "MERGED",
+            "additions": 100 * (20 - i),  # Decreasing additions
+            "deletions": 10,
+            "repository": {
+                "nameWithOwner": "owner/repo",
+                "primaryLanguage": {"name": "Python"},
+            },
+        }
+        for i in range(20)
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Mock fixtures for API calls
 # ---------------------------------------------------------------------------
@@ -80,14 +80,19 @@ class TestAggregateLanguageStats:
                 },
             ],
         }
-        result = mod.aggregate_language_stats(repos)
+        result = mod.aggregate_language_stats(repos, as_dict=True)
+
+        assert result["Python"]["commits"] == 15
+        assert result["Python"]["repos"] == 2
 
-        # Find Python in results
-        python_stats = next(
-            (r for r in result if r["language"] == "Python"), None
+    def test_as_dict_keeps_sort_order(self, mod, sample_repos_by_category):
+        """as_dict returns the same entries keyed by language, in order."""
+        as_list = mod.aggregate_language_stats(sample_repos_by_category)
+        as_dict = mod.aggregate_language_stats(
+            sample_repos_by_category, as_dict=True
         )
-        if python_stats:
-            assert python_stats["commits"] == 15
+        assert list(as_dict) == [r["language"] for r in as_list]
+        assert list(as_dict.values()) == as_list
 
 
 class TestAggregateOrgData:
@@ -194,6 +199,34 @@ class TestAggregateOrgData:
                 # alice: 30, bob: 30 = 60 total
                 assert csswg["commits"] == 60
 
+    def test_zero_commit_repo_does_not_reuse_previous_count(self, mod):
+        """A repo merged with 0 commits shouldn't add another repo's count."""
+        cat = "Web standards and specifications"
+        members = [
+            {
+                "username": "alice",
+                "repos_by_category": {
+                    cat: [{"name": "w3c/csswg-drafts", "commits": 5}]
+                },
+            },
+            {
+                "username": "bob",
+                "repos_by_category": {
+                    cat: [
+                        {"name": "whatwg/html", "commits": 7},
+                        {"name": "w3c/csswg-drafts", "commits": 0},
+                    ]
+                },
+            },
+        ]
+        result = mod.aggregate_org_data(members)
+        csswg = next(
+            r
+            for r in result["repos_by_category"][cat]
+            if r["name"] == "w3c/csswg-drafts"
+        )
+        assert csswg["commits"] == 5
+
     def test_light_mode_detection(self, mod, sample_member_data):
         """Should detect if data is from light mode."""
         result = mod.aggregate_org_data(sample_member_data)
@@ -288,24 +321,11 @@ class TestGenerateNotablePrsTable:
         # Either empty list or just header
         assert isinstance(result, list)
 
-    def test_top_15_limit(self, mod):
+    def test_top_15_limit(self, mod, twenty_prs):
         """Should limit to top 15 PRs by default."""
-        # Create 20 PRs
-        prs = [
-            {
-                "title": f"PR {i}",
-                "url": f"https://github.com/owner/repo/pull/{i}",
-                "state": "MERGED",
-                "additions": 100 * (20 - i),  # Decreasing additions
-                "deletions": 10,
-                "repository": {
-                    "nameWithOwner": "owner/repo",
-                    "primaryLanguage": {"name": "Python"},
-                },
-            }
-            for i in range(20)
-        ]
-        result = mod.generate_notable_prs_table(prs, {"owner/repo": "Python"})
+        result = mod.generate_notable_prs_table(
+            twenty_prs, {"owner/repo": "Python"}
+        )
 
         # Count data rows (excluding header and separator)
         data_rows = [r for r in result if r.startswith("|") and "---" not in r]
@@ -313,24 +333,10 @@ class TestGenerateNotablePrsTable:
         # Actually header + 15 data rows = 16 rows with "|"
         assert len(data_rows) <= 16
 
-    def test_custom_limit(self, mod):
+    def test_custom_limit(self, mod, twenty_prs):
         """Custom limit should control the number of PRs shown."""
-        prs = [
-            {
-                "title": f"PR {i}",
-                "url": f"https://github.com/owner/repo/pull/{i}",
-                "state": "MERGED",
-                "additions": 100 * (20 - i),
-                "deletions": 10,
-                "repository": {
-                    "nameWithOwner": "owner/repo",
-                    "primaryLanguage": {"name": "Python"},
-                },
-            }
-            for i in range(20)
-        ]
         result = mod.generate_notable_prs_table(
-            prs, {"owner/repo": "Python"}, limit=5
+            twenty_prs, {"owner/repo": "Python"}, limit=5
         )
 
         data_rows = [r for r in result if r.startswith("|") and "---" not in r]
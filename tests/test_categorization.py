@@ -8,67 +8,173 @@ import pytest
 class TestMatches:
     """Tests for the matches() pattern matching function."""
 
-    def test_exact_match(self, mod):
-        patterns = {"exact": ["validator/validator"]}
-        assert mod.matches("validator/validator", patterns) is True
-        assert mod.matches("other/validator", patterns) is False
-
-    def test_prefix_match(self, mod):
-        patterns = {"prefix": ["wai-", "wcag"]}
-        assert mod.matches("wai-aria", patterns) is True
-        assert mod.matches("wcag21", patterns) is True
-        assert mod.matches("something-wai", patterns) is False
-
-    def test_suffix_match(self, mod):
-        patterns = {"suffix": ["-spec", ".github.io"]}
-        assert mod.matches("html-spec", patterns) is True
+    @pytest.mark.parametrize(
+        "patterns, name, expected",
+        [
+            pytest.param(
+                {"exact": ["validator/validator"]},
+                "validator/validator",
+                True,
+                id="exact",
+            ),
+            pytest.param(
+                {"exact": ["validator/validator"]},
+                "other/validator",
+                False,
+                id="exact-miss",
+            ),
+            pytest.param(
+                {"prefix": ["wai-", "wcag"]}, "wai-aria", True, id="prefix"
+            ),
+            pytest.param(
+                {"prefix": ["wai-", "wcag"]},
+                "wcag21",
+                True,
+                id="prefix-second",
+            ),
+            pytest.param(
+                {"prefix": ["wai-", "wcag"]},
+                "something-wai",
+                False,
+                id="prefix-miss",
+            ),
+            pytest.param(
+                {"suffix": ["-spec", ".github.io"]},
+                "html-spec",
+                True,
+                id="suffix",
+            ),
+            pytest.param(
+                {"suffix": ["-spec", ".github.io"]},
+                "user.github.io",
+                True,
+                id="suffix-second",
+            ),
+            pytest.param(
+                {"suffix": ["-spec", ".github.io"]},
+                "spec-test",
+                False,
+                id="suffix-miss",
+            ),
+            pytest.param(
+                {"contains": ["sensor"]},
+                "accelerometer-sensor",
+                True,
+                id="contains-end",
+            ),
+            pytest.param(
+                {"contains": ["sensor"]},
+                "sensor-api",
+                True,
+                id="contains-start",
+            ),
+            pytest.param(
+                {"contains": ["sensor"]},
+                "my-sensor-test",
+                True,
+                id="contains-middle",
+            ),
+            pytest.param(
+                {"contains": ["sensor"]},
+                "other-thing",
+                False,
+                id="contains-miss",
+            ),
+            pytest.param(
+                {"prefix": ["media"], "exclude_prefix": ["mediacapture"]},
+                "media-session",
+                True,
+                id="exclude-prefix-allows",
+            ),
+            pytest.param(
+                {"prefix": ["media"], "exclude_prefix": ["mediacapture"]},
+                "mediacapture-streams",
+                False,
+                id="exclude-prefix",
+            ),
+            pytest.param(
+                {"contains": ["web"], "exclude_contains": ["webrtc"]},
+                "web-audio",
+                True,
+                id="exclude-contains-allows",
+            ),
+            pytest.param(
+                {"contains": ["web"], "exclude_contains": ["webrtc"]},
+                "webrtc-stats",
+                False,
+                id="exclude-contains",
+            ),
+            pytest.param({}, "anything", False, id="empty-patterns"),
+            # matches() lowercases the name before comparing, so any
+            # casing of the name matches a lowercase pattern...
+            pytest.param(
+                {"exact": ["webkit"]}, "WebKit", True, id="case-mixed"
+            ),
+            pytest.param(
+                {"exact": ["webkit"]}, "webkit", True, id="case-lower"
+            ),
+            pytest.param(
+                {"exact": ["webkit"]}, "WEBKIT", True, id="case-upper"
+            ),
+            # ...but an uppercase pattern never matches
+            pytest.param(
+                {"exact": ["WebKit"]}, "WebKit", False, id="case-upper-pattern"
+            ),
+            pytest.param(
+                {
+                    "prefix": ["test-"],
+                    "suffix": ["-spec"],
+                    "contains": ["middle"],
+                },
+                "test-something",
+                True,
+                id="multiple-prefix",
+            ),
+            pytest.param(
+                {
+                    "prefix": ["test-"],
+                    "suffix": ["-spec"],
+                    "contains": ["middle"],
+                },
+                "something-spec",
+                True,
+                id="multiple-suffix",
+            ),
+            pytest.param(
+                {
+                    "prefix": ["test-"],
+                    "suffix": ["-spec"],
+                    "contains": ["middle"],
+                },
+                "has-middle-part",
+                True,
+                id="multiple-contains",
+            ),
+            pytest.param(
+                {
+                    "prefix": ["test-"],
+                    "suffix": ["-spec"],
+                    "contains": ["middle"],
+                },
+                "nomatch",
+                False,
+                id="multiple-miss",
+            ),
+        ],
+    )
+    def test_matches(self, mod, patterns, name, expected):
+        assert mod.matches(name, patterns) is expected
+
+    def test_regex_metacharacters_are_literal(self, mod):
+        patterns = {"suffix": [".github.io"], "contains": ["c++"]}
         assert mod.matches("user.github.io", patterns) is True
-        assert mod.matches("spec-test", patterns) is False
-
-    def test_contains_match(self, mod):
-        patterns = {"contains": ["sensor"]}
-        assert mod.matches("accelerometer-sensor", patterns) is True
-        assert mod.matches("sensor-api", patterns) is True
-        assert mod.matches("my-sensor-test", patterns) is True
-        assert mod.matches("other-thing", patterns) is False
-
-    def test_exclude_prefix(self, mod):
-        patterns = {"prefix": ["media"], "exclude_prefix": ["mediacapture"]}
-        assert mod.matches("media-session", patterns) is True
-        assert mod.matches("mediacapture-streams", patterns) is False
-
-    def test_exclude_contains(self, mod):
-        patterns = {"contains": ["web"], "exclude_contains": ["webrtc"]}
-        assert mod.matches("web-audio", patterns) is True
-        assert mod.matches("webrtc-stats", patterns) is False
-
-    def test_empty_patterns(self, mod):
-        assert mod.matches("anything", {}) is False
-
-    def test_case_sensitivity(self, mod):
-        # matches() converts name to lowercase before comparing
-        # So patterns should be lowercase for exact matches
-        patterns = {"exact": ["webkit"]}
-        # Both match because name is lowercased before comparison
-        assert mod.matches("WebKit", patterns) is True
-        assert mod.matches("webkit", patterns) is True
-        assert mod.matches("WEBKIT", patterns) is True
-
-        # Uppercase pattern won't match because name is lowercased
-        patterns_upper = {"exact": ["WebKit"]}
-        # "webkit" != "WebKit"
-        assert mod.matches("WebKit", patterns_upper) is False
-
-    def test_multiple_pattern_types(self, mod):
-        patterns = {
-            "prefix": ["test-"],
-            "suffix": ["-spec"],
-            "contains": ["middle"],
-        }
-        assert mod.matches("test-something", patterns) is True
-        assert mod.matches("something-spec", patterns) is True
-        assert mod.matches("has-middle-part", patterns) is True
-        assert mod.matches("nomatch", patterns) is False
+        assert mod.matches("user-githubxio", patterns) is False
+        assert mod.matches("c++-parser", patterns) is True
+        assert mod.matches("cc-parser", patterns) is False
+
+    def test_compile_patterns_without_match_kinds(self, mod):
+        assert mod.compile_patterns({}) is None
+        assert mod.compile_patterns({"exclude_prefix": ["x"]}) is None
 
 
 class TestGetCategoryFromTopics:
@@ -212,129 +318,135 @@ class TestCategorizeRepo:
             result = mod.get_category("randomuser123/my-random-project-xyz")
         assert result == "Other"
 
+    def test_name_cache_does_not_pin_topic_fallback(self, mod):
+        """Only the name-based result is cached, not the topic lookup."""
+        name = "randomuser/uncached-topics-thing"
+        assert mod.get_category_from_name(name) is None
+        with patch.object(
+            mod, "fetch_repo_topics", return_value=["machine-learning"]
+        ):
+            assert mod.get_category(name) == "ML frameworks"
+        with patch.object(
+            mod, "fetch_repo_topics", return_value=["kubernetes"]
+        ):
+            assert mod.get_category(name) == "DevOps"
+
 
 class TestShouldSkipRepo:
     """Tests for the should_skip_repo filtering function."""
 
-    def test_private_repo_skipped(self, mod):
-        """Private repos should be skipped."""
-        repo_info = {"isPrivate": True}
-        result = mod.should_skip_repo("user/private-repo", repo_info=repo_info)
-        assert result is True
-
-    def test_profile_repo_skipped(self, mod):
-        """Profile repos (username/username) should be skipped."""
-        result = mod.should_skip_repo("octocat/octocat", username="octocat")
-        assert result is True
-
-    def test_normal_repo_not_skipped(self, mod):
-        """Regular public repos should not be skipped."""
-        result = mod.should_skip_repo(
-            "octocat/hello-world", username="octocat"
-        )
-        assert result is False
-
-    def test_serenity_repo_skipped(self, mod):
-        """Repos with 'serenity' in name should be skipped."""
-        result = mod.should_skip_repo("someuser/serenity-fork")
-        assert result is True
-
-    def test_empty_repo_name_skipped(self, mod):
-        """Empty repo name should be skipped."""
-        result = mod.should_skip_repo("")
-        assert result is True
-        result = mod.should_skip_repo(None)
-        assert result is True
-
-    def test_ladybird_copies_set_skipped(self, mod):
-        """Known Ladybird copy repos should be skipped."""
-        result = mod.should_skip_repo("zechy0055/qosta-broswer")
-        assert result is True
-
-    def test_firefox_copies_set_skipped(self, mod):
-        """Known Firefox copy repos should be skipped."""
-        result = mod.should_skip_repo("mozilla/gecko-dev")
-        assert result is True
-
-    def test_serenity_copies_set_skipped(self, mod):
-        """Known SerenityOS copy repos should be skipped."""
-        result = mod.should_skip_repo("serenityos/serenity")
-        assert result is True
-
-    def test_ladybird_related_name_skipped(self, mod):
-        """Repos with 'lady' in name (not the canonical one) are skipped."""
-        result = mod.should_skip_repo("random/ladybird-fork")
-        assert result is True
-
-    def test_ladybird_canonical_not_skipped(self, mod):
-        """The canonical Ladybird repo should not be skipped."""
-        result = mod.should_skip_repo("ladybirdbrowser/ladybird")
-        assert result is False
-
-    def test_ladybird_user_fork_not_skipped(self, mod):
-        """A user's own Ladybird fork should not be skipped."""
-        result = mod.should_skip_repo("myuser/ladybird", username="myuser")
-        assert result is False
-
-    def test_firefox_allowed_list_not_skipped(self, mod):
-        """The canonical Firefox repo should not be skipped."""
-        result = mod.should_skip_repo("mozilla-firefox/firefox")
-        assert result is False
-
-    def test_firefox_user_fork_not_skipped(self, mod):
-        """A user's own Firefox fork should not be skipped."""
-        result = mod.should_skip_repo("myuser/firefox", username="myuser")
-        assert result is False
-
-    def test_fork_parent_ladybird_skipped(self, mod):
-        """Repo forked from ladybirdbrowser/ladybird should be skipped."""
-        repo_info = {
-            "parent": {"nameWithOwner": "ladybirdbrowser/ladybird"},
-        }
-        result = mod.should_skip_repo(
-            "someuser/renamed-browser", repo_info=repo_info
-        )
-        assert result is True
-
-    def test_fork_description_ladybird_skipped(self, mod):
-        """Repo with 'ladybird' in description should be skipped."""
-        repo_info = {
-            "description": "A fork of the Ladybird browser engine",
-        }
-        result = mod.should_skip_repo(
-            "someuser/my-browser", repo_info=repo_info
-        )
-        assert result is True
-
-    def test_fork_description_truly_independent_skipped(self, mod):
-        """Repo with Ladybird tagline description should be skipped."""
-        repo_info = {
-            "description": "Truly independent web browser",
-        }
-        result = mod.should_skip_repo(
-            "someuser/my-project", repo_info=repo_info
-        )
-        assert result is True
-
-    def test_fork_parent_firefox_skipped(self, mod):
-        """Repo forked from mozilla-firefox/firefox should be skipped."""
-        repo_info = {
-            "parent": {"nameWithOwner": "mozilla-firefox/firefox"},
-        }
-        result = mod.should_skip_repo(
-            "someuser/renamed-fox", repo_info=repo_info
-        )
-        assert result is True
-
-    def test_fork_description_firefox_skipped(self, mod):
-        """Repo with Firefox official description should be skipped."""
-        repo_info = {
-            "description": (
-                "The official repository of Mozilla's Firefox web browser"
+    @pytest.mark.parametrize(
+        "repo_name, kwargs, expected",
+        [
+            # Private repos are skipped
+            pytest.param(
+                "user/private-repo",
+                {"repo_info": {"isPrivate": True}},
+                True,
+                id="private",
             ),
-        }
-        result = mod.should_skip_repo("someuser/my-fox", repo_info=repo_info)
-        assert result is True
+            # Profile repos (username/username) are skipped
+            pytest.param(
+                "octocat/octocat", {"username": "octocat"}, True, id="profile"
+            ),
+            pytest.param(
+                "octocat/hello-world",
+                {"username": "octocat"},
+                False,
+                id="normal-repo",
+            ),
+            # Anything with "serenity" in the name is skipped
+            pytest.param(
+                "someuser/serenity-fork", {}, True, id="serenity-name"
+            ),
+            pytest.param("", {}, True, id="empty-name"),
+            pytest.param(None, {}, True, id="none-name"),
+            # Known copies from the blocklists
+            pytest.param(
+                "zechy0055/qosta-broswer", {}, True, id="ladybird-copies"
+            ),
+            pytest.param("mozilla/gecko-dev", {}, True, id="firefox-copies"),
+            pytest.param(
+                "serenityos/serenity", {}, True, id="serenity-copies"
+            ),
+            # "lady" in the name, unless canonical or the user's own fork
+            pytest.param("random/ladybird-fork", {}, True, id="ladybird-name"),
+            pytest.param(
+                "ladybirdbrowser/ladybird", {}, False, id="ladybird-canonical"
+            ),
+            pytest.param(
+                "myuser/ladybird",
+                {"username": "myuser"},
+                False,
+                id="ladybird-user-fork",
+            ),
+            pytest.param(
+                "mozilla-firefox/firefox", {}, False, id="firefox-canonical"
+            ),
+            pytest.param(
+                "myuser/firefox",
+                {"username": "myuser"},
+                False,
+                id="firefox-user-fork",
+            ),
+            # Renamed forks/copies detected from parent or description
+            pytest.param(
+                "someuser/renamed-browser",
+                {
+                    "repo_info": {
+                        "parent": {"nameWithOwner": "ladybirdbrowser/ladybird"}
+                    }
+                },
+                True,
+                id="ladybird-parent",
+            ),
+            pytest.param(
+                "someuser/my-browser",
+                {
+                    "repo_info": {
+                        "description": "A fork of the Ladybird browser engine"
+                    }
+                },
+                True,
+                id="ladybird-description",
+            ),
+            pytest.param(
+                "someuser/my-project",
+                {
+                    "repo_info": {
+                        "description": "Truly independent web browser"
+                    }
+                },
+                True,
+                id="ladybird-tagline",
+            ),
+            pytest.param(
+                "someuser/renamed-fox",
+                {
+                    "repo_info": {
+                        "parent": {"nameWithOwner": "mozilla-firefox/firefox"}
+                    }
+                },
+                True,
+                id="firefox-parent",
+            ),
+            pytest.param(
+                "someuser/my-fox",
+                {
+                    "repo_info": {
+                        "description": (
+                            "The official repository of Mozilla's Firefox"
+                            " web browser"
+                        )
+                    }
+                },
+                True,
+                id="firefox-description",
+            ),
+        ],
+    )
+    def test_should_skip_repo(self, mod, repo_name, kwargs, expected):
+        assert mod.should_skip_repo(repo_name, **kwargs) is expected
 
 
 class TestCategoryPriority:
@@ -374,34 +486,33 @@ class TestCategoryPriority:
 
 
 class TestCategorizeRepoEdgeCases:
-    """Edge cases for EXPLICIT_REPOS loop and standards-positions."""
-
-    def test_explicit_repo_key_without_slash(self, mod):
+    """Edge cases for the EXPLICIT_REPOS index and standards-positions."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_category_caches(self, mod):
+        """Keep EXPLICIT_REPOS-derived caches from leaking across tests.
+
+        Autouse fixtures are set up before monkeypatch, so this teardown
+        runs after monkeypatch has restored EXPLICIT_REPOS.
+        """
+        mod.explicit_base_index.cache_clear()
+        mod.get_category_from_name.cache_clear()
+        yield
+        mod.explicit_base_index.cache_clear()
+        mod.get_category_from_name.cache_clear()
+
+    def test_explicit_repo_key_without_slash(self, mod, monkeypatch):
         """EXPLICIT_REPOS key without '/' uses full key as base."""
-        original = dict(mod.EXPLICIT_REPOS)
-        mod.EXPLICIT_REPOS["mybare"] = "Test Category"
-        try:
-            result = mod.get_category("anyuser/mybare")
-            assert result == "Test Category"
-        finally:
-            mod.EXPLICIT_REPOS.clear()
-            mod.EXPLICIT_REPOS.update(original)
-
-    def test_standards_positions_standalone_check(self, mod):
-        """standards-positions matched by dedicated check."""
-        original = dict(mod.EXPLICIT_REPOS)
+        monkeypatch.setitem(mod.EXPLICIT_REPOS, "mybare", "Test Category")
+        result = mod.get_category("anyuser/mybare")
+        assert result == "Test Category"
+
+    def test_standards_positions_standalone_check(self, mod, monkeypatch):
+        """standards-positions matched without an EXPLICIT_REPOS entry."""
         # Remove entries whose base name is "standards-positions"
-        # so the standalone check on line 1746 is reached
-        filtered = {
-            k: v
-            for k, v in original.items()
-            if k.split("/")[-1] != "standards-positions"
-        }
-        mod.EXPLICIT_REPOS.clear()
-        mod.EXPLICIT_REPOS.update(filtered)
-        try:
-            result = mod.get_category("neworg/standards-positions")
-            assert result == "Standards positions"
-        finally:
-            mod.EXPLICIT_REPOS.clear()
-            mod.EXPLICIT_REPOS.update(original)
+        # so only the index's standards-positions default can match
+        for key in list(mod.EXPLICIT_REPOS):
+            if key.split("/")[-1] == "standards-positions":
+                monkeypatch.delitem(mod.EXPLICIT_REPOS, key)
+        result = mod.get_category("neworg/standards-positions")
+        assert result == "Standards positions"
@@ -1,24 +1,124 @@
 """Tests for CLI argument parsing (parse_and_validate_args) and run()."""
 
+import copy
+import io
+import json
 import subprocess
-import sys
+from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from tests.conftest import load_chronicle_module  # noqa: E402
+from tests.conftest import load_chronicle_module
 
 mod = load_chronicle_module()
 
+# Minimal gather_user_data() result; _user_data() returns a fresh copy
+_EMPTY_USER_DATA = {
+    "user_real_name": "",
+    "total_commits_default_branch": 0,
+    "total_commits_all": 0,
+    "total_prs": 0,
+    "total_pr_reviews": 0,
+    "total_issues": 0,
+    "total_additions": 0,
+    "total_deletions": 0,
+    "test_commits": 0,
+    "repos_contributed": 0,
+    "reviews_received": 0,
+    "pr_comments_received": 0,
+    "repos_by_category": {},
+    "repo_line_stats": {},
+    "repo_languages": {},
+    "prs_nodes": [],
+    "reviewed_nodes": [],
+}
+
+_ALICE_TOTALS = {
+    "user_real_name": "Alice",
+    "total_commits_default_branch": 10,
+    "total_commits_all": 10,
+    "total_prs": 2,
+    "total_pr_reviews": 1,
+    "total_additions": 100,
+    "total_deletions": 20,
+    "repos_contributed": 1,
+}
+
+# Aggregated org data with just the keys the JSON formatter reads
+_EMPTY_AGGREGATED = {
+    "repos_by_category": {},
+    "prs_nodes": [],
+    "reviewed_nodes": [],
+}
+
+
+# RunConfig is an immutable namedtuple, so these user- and org-mode bases
+# are shared and each test derives its variant with _replace()
+_RUN_CONFIG = mod.RunConfig(
+    username="alice",
+    org=None,
+    team=None,
+    owners=False,
+    private=False,
+    since_date="2026-01-01",
+    until_date="2026-01-07",
+    output=None,
+    stdout=False,
+    yes=False,
+    format=None,
+    notable_prs=15,
+)
+_ORG_CONFIG = _RUN_CONFIG._replace(username=None, org="myorg")
+
+
+class _Stub:
+    """Callable that returns a fixed value and counts its calls.
+
+    A cheaper stand-in for MagicMock where a test only needs a canned
+    return value: no child mocks, no recorded call history.
+    """
+
+    __slots__ = ("return_value", "calls")
+
+    def __init__(self, return_value=None):
+        self.return_value = return_value
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.return_value
+
+
+def _user_data(**overrides):
+    """Return a fresh gather_user_data() result with optional overrides."""
+    return copy.deepcopy({**_EMPTY_USER_DATA, **overrides})
+
+
+def _org_gather_result(aggregated=None):
+    """Return a fresh gather_org_data_active_contributors() result."""
+    return (
+        {"login": "myorg"},  # org_info
+        None,  # team_info
+        [],  # members
+        copy.deepcopy(aggregated) if aggregated else {},  # aggregated
+        [],  # member_data
+    )
+
 
 # -----------------------------------------------------------------------
 # TestParseAndValidateArgs
 # -----------------------------------------------------------------------
 
 
+@pytest.fixture(scope="session")
+def parser():
+    """The cached argparse parser behind parse_and_validate_args()."""
+    return mod.build_parser()
+
+
 class TestParseAndValidateArgs:
     """Tests for parse_and_validate_args()."""
 
@@ -42,23 +142,20 @@ class TestParseAndValidateArgs:
         assert config.team == "editors"
         assert config.username is None
 
-    def test_date_option_days(self):
-        config = mod.parse_and_validate_args(["--user", "x", "--days", "14"])
-        # since_date should be 14 days ago (we just check it's a valid date)
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            pytest.param(["--days", "14"], id="days"),
+            pytest.param(["--weeks", "2"], id="weeks"),
+            pytest.param(["--months", "3"], id="months"),
+            pytest.param(["--year"], id="year"),
+        ],
+    )
+    def test_date_option(self, parser, argv):
+        config = mod.validate_args(parser.parse_args(["--user", "x"] + argv))
+        # since_date is relative to today; just check it's a valid date
         assert len(config.since_date) == 10  # YYYY-MM-DD
 
-    def test_date_option_weeks(self):
-        config = mod.parse_and_validate_args(["--user", "x", "--weeks", "2"])
-        assert len(config.since_date) == 10
-
-    def test_date_option_months(self):
-        config = mod.parse_and_validate_args(["--user", "x", "--months", "3"])
-        assert len(config.since_date) == 10
-
-    def test_date_option_year(self):
-        config = mod.parse_and_validate_args(["--user", "x", "--year"])
-        assert len(config.since_date) == 10
-
     def test_date_option_since_until(self):
         config = mod.parse_and_validate_args(
             ["--user", "x", "--since", "2025-06-01", "--until", "2025-06-30"]
@@ -66,71 +163,64 @@ class TestParseAndValidateArgs:
         assert config.since_date == "2025-06-01"
         assert config.until_date == "2025-06-30"
 
-    def test_date_default_7_days(self):
-        config = mod.parse_and_validate_args(["--user", "x"])
+    def test_date_default_7_days(self, parser):
+        config = mod.validate_args(parser.parse_args(["--user", "x"]))
         # Default is 7 days back; just check we get a valid date string
         assert len(config.since_date) == 10
 
-    def test_until_defaults_to_today(self):
-        from datetime import datetime
+    def test_parser_is_built_once(self, parser):
+        assert mod.build_parser() is parser
 
+    def test_until_defaults_to_today(self):
         config = mod.parse_and_validate_args(["--user", "x"])
         assert config.until_date == datetime.now().strftime("%Y-%m-%d")
 
     # -- Validation errors (7 checks) --
 
-    def test_error_org_and_user(self):
-        with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(["--org", "o", "--user", "u"])
-        assert exc_info.value.code == 1
-
-    def test_error_team_without_org(self):
-        with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(["--team", "t"])
-        assert exc_info.value.code == 1
-
-    def test_error_owners_without_org(self):
-        with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(["--owners"])
-        assert exc_info.value.code == 1
-
-    def test_error_owners_and_team(self):
-        with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(
-                ["--org", "o", "--owners", "--team", "t"]
-            )
-        assert exc_info.value.code == 1
-
-    def test_error_private_without_org(self):
-        with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(["--private"])
-        assert exc_info.value.code == 1
-
-    def test_error_private_and_team(self):
-        with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(
-                ["--org", "o", "--private", "--team", "t", "--yes"]
-            )
-        assert exc_info.value.code == 1
-
-    def test_error_private_and_owners(self):
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            pytest.param(["--org", "o", "--user", "u"], id="org_and_user"),
+            pytest.param(["--team", "t"], id="team_without_org"),
+            pytest.param(["--owners"], id="owners_without_org"),
+            pytest.param(
+                ["--org", "o", "--owners", "--team", "t"], id="owners_and_team"
+            ),
+            pytest.param(["--private"], id="private_without_org"),
+            pytest.param(
+                ["--org", "o", "--private", "--team", "t", "--yes"],
+                id="private_and_team",
+            ),
+            pytest.param(
+                ["--org", "o", "--private", "--owners", "--yes"],
+                id="private_and_owners",
+            ),
+        ],
+    )
+    def test_validation_error(self, argv):
         with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(
-                ["--org", "o", "--private", "--owners", "--yes"]
-            )
+            mod.parse_and_validate_args(argv)
         assert exc_info.value.code == 1
 
     # -- Invalid date formats --
 
-    def test_invalid_since_format(self):
+    @pytest.mark.parametrize("option", ["--since", "--until"])
+    def test_invalid_date_format(self, option):
         with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(["--user", "x", "--since", "nope"])
+            mod.parse_and_validate_args(["--user", "x", option, "nope"])
         assert exc_info.value.code == 1
 
-    def test_invalid_until_format(self):
-        with pytest.raises(SystemExit) as exc_info:
-            mod.parse_and_validate_args(["--user", "x", "--until", "nope"])
-        assert exc_info.value.code == 1
+    @pytest.mark.parametrize(
+        "date_str", ["2026-01-07", "2024-02-29", "2026-1-7"]
+    )
+    def test_parse_date_matches_strptime(self, date_str):
+        expected = datetime.strptime(date_str, "%Y-%m-%d")
+        assert mod.parse_date(date_str) == expected
+
+    @pytest.mark.parametrize("date_str", ["2026-02-30", "2026-13-01", "nope"])
+    def test_parse_date_rejects_invalid(self, date_str):
+        with pytest.raises(ValueError):
+            mod.parse_date(date_str)
 
     # -- stdout flag --
 
@@ -155,18 +245,18 @@ class TestParseAndValidateArgs:
         assert config.yes is True
 
     def test_private_without_yes_decline(self):
-        with patch("builtins.input", return_value="n"):
+        with patch.object(mod, "_confirm", return_value="n"):
             with pytest.raises(SystemExit) as exc_info:
                 mod.parse_and_validate_args(["--org", "o", "--private"])
             assert exc_info.value.code == 0
 
     def test_private_without_yes_accept(self):
-        with patch("builtins.input", return_value="y"):
+        with patch.object(mod, "_confirm", return_value="y"):
             config = mod.parse_and_validate_args(["--org", "o", "--private"])
             assert config.private is True
 
     def test_private_without_yes_eoferror(self):
-        with patch("builtins.input", side_effect=EOFError):
+        with patch.object(mod, "_confirm", side_effect=EOFError):
             with pytest.raises(SystemExit) as exc_info:
                 mod.parse_and_validate_args(["--org", "o", "--private"])
             assert exc_info.value.code == 0
@@ -181,89 +271,58 @@ class TestParseAndValidateArgs:
 
     # -- format flag --
 
-    def test_format_default_none(self):
-        config = mod.parse_and_validate_args(["--user", "x"])
-        assert config.format is None
-
-    def test_format_explicit_json(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--format", "json"]
-        )
-        assert config.format == "json"
-
-    def test_format_explicit_html(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--format", "html"]
-        )
-        assert config.format == "html"
-
-    def test_format_short_flag(self):
-        config = mod.parse_and_validate_args(["--user", "x", "-f", "json"])
-        assert config.format == "json"
+    @pytest.mark.parametrize(
+        "argv,expected",
+        [
+            pytest.param([], None, id="default_none"),
+            pytest.param(["--format", "json"], "json", id="explicit_json"),
+            pytest.param(["--format", "html"], "html", id="explicit_html"),
+            pytest.param(["-f", "json"], "json", id="short_flag"),
+            pytest.param(
+                ["--output", "report.json"], "json", id="inferred_from_json"
+            ),
+            pytest.param(
+                ["--output", "report.html"], "html", id="inferred_from_html"
+            ),
+            pytest.param(
+                ["--output", "report.htm"], "html", id="inferred_from_htm"
+            ),
+            pytest.param(["--output", "report.md"], None, id="inferred_md"),
+            pytest.param(
+                ["--output", "report.txt"], None, id="inferred_unknown_ext"
+            ),
+            pytest.param(
+                ["--format", "json", "--output", "report.html"],
+                "json",
+                id="explicit_overrides_extension",
+            ),
+        ],
+    )
+    def test_format(self, parser, argv, expected):
+        config = mod.validate_args(parser.parse_args(["--user", "x"] + argv))
+        assert config.format == expected
 
     def test_format_invalid_choice(self):
         with pytest.raises(SystemExit):
             mod.parse_and_validate_args(["--user", "x", "--format", "csv"])
 
-    def test_format_inferred_from_json_output(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--output", "report.json"]
-        )
-        assert config.format == "json"
-
-    def test_format_inferred_from_html_output(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--output", "report.html"]
-        )
-        assert config.format == "html"
-
-    def test_format_inferred_from_htm_output(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--output", "report.htm"]
-        )
-        assert config.format == "html"
-
-    def test_format_inferred_md_is_none(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--output", "report.md"]
-        )
-        assert config.format is None
-
-    def test_format_inferred_unknown_ext_is_none(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--output", "report.txt"]
-        )
-        assert config.format is None
-
-    def test_format_explicit_overrides_extension(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--format", "json", "--output", "report.html"]
-        )
-        assert config.format == "json"
-
     # -- notable-prs flag --
 
-    def test_notable_prs_default_7_days(self):
-        config = mod.parse_and_validate_args(["--user", "x"])
-        assert config.notable_prs == 15
-
-    def test_notable_prs_default_30_days(self):
-        config = mod.parse_and_validate_args(["--user", "x", "--days", "30"])
-        assert config.notable_prs == 25
-
-    def test_notable_prs_default_90_days(self):
-        config = mod.parse_and_validate_args(["--user", "x", "--months", "3"])
-        assert config.notable_prs == 35
-
-    def test_notable_prs_default_year(self):
-        config = mod.parse_and_validate_args(["--user", "x", "--year"])
-        assert config.notable_prs == 50
-
-    def test_notable_prs_explicit_overrides(self):
-        config = mod.parse_and_validate_args(
-            ["--user", "x", "--year", "--notable-prs", "10"]
-        )
-        assert config.notable_prs == 10
+    @pytest.mark.parametrize(
+        "argv,expected",
+        [
+            pytest.param([], 15, id="default_7_days"),
+            pytest.param(["--days", "30"], 25, id="default_30_days"),
+            pytest.param(["--months", "3"], 35, id="default_90_days"),
+            pytest.param(["--year"], 50, id="default_year"),
+            pytest.param(
+                ["--year", "--notable-prs", "10"], 10, id="explicit_overrides"
+            ),
+        ],
+    )
+    def test_notable_prs(self, parser, argv, expected):
+        config = mod.validate_args(parser.parse_args(["--user", "x"] + argv))
+        assert config.notable_prs == expected
 
 
 # -----------------------------------------------------------------------
@@ -274,641 +333,307 @@ class TestParseAndValidateArgs:
 class TestRun:
     """Tests for run()."""
 
-    def _make_config(self, **overrides):
-        """Build a RunConfig with sensible defaults."""
-        defaults = dict(
-            username="alice",
-            org=None,
-            team=None,
-            owners=False,
-            private=False,
-            since_date="2026-01-01",
-            until_date="2026-01-07",
-            output=None,
-            stdout=False,
-            yes=False,
-            format=None,
-            notable_prs=15,
-        )
-        defaults.update(overrides)
-        return mod.RunConfig(**defaults)
-
-    def test_user_mode_writes_file(self, tmp_path):
-        config = self._make_config(format="markdown")
+    @pytest.fixture
+    def run_mocks(self, monkeypatch):
+        """Stub out data gathering, report generation and progress.
+
+        Tests set return values on the returned namespace and assert on
+        its mocks; monkeypatch undoes everything afterwards.
+        """
+        mocks = SimpleNamespace(
+            gather_user_data=_Stub(_user_data()),
+            gather_org_data_active_contributors=_Stub(_org_gather_result()),
+            generate_report=_Stub("# mock report"),
+            generate_org_report=_Stub("# org report"),
+            progress=MagicMock(),
+        )
+        for name, stub in vars(mocks).items():
+            monkeypatch.setattr(mod, name, stub)
+        # Handed to run() as its writer rather than patched onto Path;
+        # each report it is given lands in writes as (path, content)
+        mocks.writes = []
+
+        def write_text(path, content):
+            mocks.writes.append((path, content))
+
+        mocks.write_text = write_text
+        return mocks
+
+    def test_user_mode_writes_file(self, run_mocks):
+        config = _RUN_CONFIG._replace(format="markdown")
         report_text = "# mock report"
+        run_mocks.generate_report.return_value = report_text
 
-        with (
-            patch.object(mod, "generate_report", return_value=report_text),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            # We need to patch so write_text is called but doesn't
-            # actually write; just verify it was called
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        mock_write.assert_called_once_with(report_text)
+        assert run_mocks.writes == [
+            (Path("alice-2026-01-01-to-2026-01-07.md"), report_text)
+        ]
 
-    def test_user_mode_stdout(self, capsys):
-        config = self._make_config(stdout=True, format="markdown")
+    def test_user_mode_stdout(self, run_mocks):
+        config = _RUN_CONFIG._replace(stdout=True, format="markdown")
         report_text = "# stdout report"
+        run_mocks.generate_report.return_value = report_text
 
-        with patch.object(mod, "generate_report", return_value=report_text):
-            mod.run(config)
+        out = io.StringIO()
+        mod.run(config, out=out)
 
-        captured = capsys.readouterr()
-        assert captured.out.strip() == report_text
+        assert out.getvalue().strip() == report_text
 
-    def test_user_mode_explicit_output(self):
-        config = self._make_config(output="custom.md", format="markdown")
+    def test_user_mode_explicit_output(self, run_mocks):
+        config = _RUN_CONFIG._replace(output="custom.md", format="markdown")
         report_text = "# custom output"
+        run_mocks.generate_report.return_value = report_text
 
-        with (
-            patch.object(mod, "generate_report", return_value=report_text),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        # The Path instance should be constructed with "custom.md"
-        mock_write.assert_called_once_with(report_text)
+        assert run_mocks.writes == [(Path("custom.md"), report_text)]
 
-    def test_org_mode_writes_file(self):
-        config = self._make_config(
-            username=None,
-            org="myorg",
-            format="markdown",
-        )
+    def test_org_mode_writes_file(self, run_mocks):
+        config = _ORG_CONFIG._replace(format="markdown")
         report_text = "# org report"
-        gather_result = (
-            {"login": "myorg"},  # org_info
-            None,  # team_info
-            [],  # members
-            {},  # aggregated
-            [],  # member_data
-        )
+        run_mocks.generate_org_report.return_value = report_text
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-            patch.object(
-                mod,
-                "generate_org_report",
-                return_value=report_text,
-            ),
-            patch.object(mod, "progress"),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        mock_write.assert_called_once_with(report_text)
+        assert run_mocks.writes == [
+            (Path("myorg-2026-01-01-to-2026-01-07.md"), report_text)
+        ]
 
-    def test_org_mode_team_filename(self):
-        config = self._make_config(
-            username=None,
-            org="myorg",
-            team="editors",
-            format="markdown",
-        )
+    def test_org_mode_team_filename(self, run_mocks):
+        config = _ORG_CONFIG._replace(team="editors", format="markdown")
         report_text = "# team report"
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {},
-            [],
-        )
+        run_mocks.generate_org_report.return_value = report_text
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-            patch.object(
-                mod,
-                "generate_org_report",
-                return_value=report_text,
-            ),
-            patch.object(mod, "progress"),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
         # Default filename should include team slug
-        # Verify write_text was called (the Path object was constructed
-        # with myorg-editors-... filename)
-        mock_write.assert_called_once_with(report_text)
-
-    def test_org_mode_owners_filename(self):
-        config = self._make_config(
-            username=None,
-            org="myorg",
-            owners=True,
-            format="markdown",
-        )
+        assert run_mocks.writes == [
+            (Path("myorg-editors-2026-01-01-to-2026-01-07.md"), report_text)
+        ]
+
+    def test_org_mode_owners_filename(self, run_mocks):
+        config = _ORG_CONFIG._replace(owners=True, format="markdown")
         report_text = "# owners report"
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {},
-            [],
-        )
+        run_mocks.generate_org_report.return_value = report_text
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-            patch.object(
-                mod,
-                "generate_org_report",
-                return_value=report_text,
-            ),
-            patch.object(mod, "progress"),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        mock_write.assert_called_once_with(report_text)
+        assert run_mocks.writes == [
+            (Path("myorg-owners-2026-01-01-to-2026-01-07.md"), report_text)
+        ]
 
     # -- JSON format tests --
 
-    def test_user_mode_json_stdout(self, capsys):
-        config = self._make_config(stdout=True, format="json")
-        mock_data = {
-            "user_real_name": "Alice",
-            "total_commits_default_branch": 10,
-            "total_commits_all": 10,
-            "total_prs": 2,
-            "total_pr_reviews": 1,
-            "total_issues": 0,
-            "total_additions": 100,
-            "total_deletions": 20,
-            "test_commits": 0,
-            "repos_contributed": 1,
-            "reviews_received": 0,
-            "pr_comments_received": 0,
-            "repos_by_category": {},
-            "repo_line_stats": {},
-            "repo_languages": {},
-            "prs_nodes": [],
-            "reviewed_nodes": [],
-        }
-
-        with patch.object(mod, "gather_user_data", return_value=mock_data):
-            mod.run(config)
-
-        import json
-
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+    def test_user_mode_json_stdout(self, run_mocks):
+        config = _RUN_CONFIG._replace(stdout=True, format="json")
+        run_mocks.gather_user_data.return_value = _user_data(**_ALICE_TOTALS)
+
+        out = io.StringIO()
+        mod.run(config, out=out)
+
+        output = json.loads(out.getvalue())
         assert output["meta"]["tool"] == "gh-activity-chronicle"
         assert output["meta"]["username"] == "alice"
         assert "data" in output
         assert "report" in output
 
-    def test_org_mode_json_stdout(self, capsys):
-        config = self._make_config(
-            username=None, org="myorg", stdout=True, format="json"
-        )
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {"repos_by_category": {}, "prs_nodes": [], "reviewed_nodes": []},
-            [],
-        )
+    def test_org_mode_json_stdout(self, run_mocks):
+        config = _ORG_CONFIG._replace(stdout=True, format="json")
+        gather = run_mocks.gather_org_data_active_contributors
+        gather.return_value = _org_gather_result(_EMPTY_AGGREGATED)
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-        ):
-            mod.run(config)
+        out = io.StringIO()
+        mod.run(config, out=out)
 
-        import json
-
-        captured = capsys.readouterr()
-        output = json.loads(captured.out)
+        output = json.loads(out.getvalue())
         assert output["meta"]["org"]["login"] == "myorg"
         assert "data" in output
         assert "report" in output
 
     # -- HTML format tests --
 
-    def test_user_mode_html_stdout(self, capsys):
-        config = self._make_config(stdout=True, format="html")
+    def test_user_mode_html_stdout(self, run_mocks):
+        config = _RUN_CONFIG._replace(stdout=True, format="html")
         report_md = "# Test Report\n\n**Period:** 2026-01-01 to 2026-01-07"
+        run_mocks.generate_report.return_value = report_md
 
-        with patch.object(mod, "generate_report", return_value=report_md):
-            mod.run(config)
+        out = io.StringIO()
+        mod.run(config, out=out)
 
-        captured = capsys.readouterr()
-        assert "<!DOCTYPE html>" in captured.out
-        assert "<h1>" in captured.out
+        assert "<!DOCTYPE html>" in out.getvalue()
+        assert "<h1>" in out.getvalue()
 
-    def test_org_mode_html_stdout(self, capsys):
-        config = self._make_config(
-            username=None, org="myorg", stdout=True, format="html"
-        )
-        report_md = "# Org Report"
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {},
-            [],
-        )
+    def test_org_mode_html_stdout(self, run_mocks):
+        config = _ORG_CONFIG._replace(stdout=True, format="html")
+        run_mocks.generate_org_report.return_value = "# Org Report"
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-            patch.object(
-                mod,
-                "generate_org_report",
-                return_value=report_md,
-            ),
-            patch.object(mod, "progress"),
-        ):
-            mod.run(config)
+        out = io.StringIO()
+        mod.run(config, out=out)
 
-        captured = capsys.readouterr()
-        assert "<!DOCTYPE html>" in captured.out
+        assert "<!DOCTYPE html>" in out.getvalue()
 
     # -- Default filename extension tests --
 
-    def test_json_default_filename_extension(self):
-        config = self._make_config(format="json")
-        mock_data = {
-            "user_real_name": "",
-            "total_commits_default_branch": 0,
-            "total_commits_all": 0,
-            "total_prs": 0,
-            "total_pr_reviews": 0,
-            "total_issues": 0,
-            "total_additions": 0,
-            "total_deletions": 0,
-            "test_commits": 0,
-            "repos_contributed": 0,
-            "reviews_received": 0,
-            "pr_comments_received": 0,
-            "repos_by_category": {},
-            "repo_line_stats": {},
-            "repo_languages": {},
-            "prs_nodes": [],
-            "reviewed_nodes": [],
-        }
+    def test_json_default_filename_extension(self, run_mocks):
+        config = _RUN_CONFIG._replace(format="json")
 
-        with (
-            patch.object(mod, "gather_user_data", return_value=mock_data),
-            patch.object(Path, "write_text"),
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        # Verify the default filename ends with .json
-        # (checked via the Path constructor call)
+        assert [str(p) for p, _ in run_mocks.writes] == [
+            "alice-2026-01-01-to-2026-01-07.json"
+        ]
 
-    def test_html_default_filename_extension(self):
-        config = self._make_config(format="html")
-        report_md = "# Report"
+    def test_html_default_filename_extension(self, run_mocks):
+        config = _RUN_CONFIG._replace(format="html")
+        run_mocks.generate_report.return_value = "# Report"
 
-        with (
-            patch.object(mod, "generate_report", return_value=report_md),
-            patch.object(Path, "write_text"),
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
+
+        assert [str(p) for p, _ in run_mocks.writes] == [
+            "alice-2026-01-01-to-2026-01-07.html"
+        ]
 
     # -- All-formats (default) tests --
 
-    def test_user_mode_all_formats_writes_three_files(self, tmp_path):
-        config = self._make_config()  # format=None → all formats
-        mock_data = {
-            "user_real_name": "Alice",
-            "total_commits_default_branch": 10,
-            "total_commits_all": 10,
-            "total_prs": 2,
-            "total_pr_reviews": 1,
-            "total_issues": 0,
-            "total_additions": 100,
-            "total_deletions": 20,
-            "test_commits": 0,
-            "repos_contributed": 1,
-            "reviews_received": 0,
-            "pr_comments_received": 0,
-            "repos_by_category": {},
-            "repo_line_stats": {},
-            "repo_languages": {},
-            "prs_nodes": [],
-            "reviewed_nodes": [],
-        }
-        md_report = "# mock report"
+    def test_user_mode_all_formats_writes_three_files(self, run_mocks):
+        config = _RUN_CONFIG  # format=None → all formats
+        run_mocks.gather_user_data.return_value = _user_data(**_ALICE_TOTALS)
 
-        with (
-            patch.object(mod, "gather_user_data", return_value=mock_data),
-            patch.object(mod, "generate_report", return_value=md_report),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
-
-        assert mock_write.call_count == 3
-
-    def test_user_mode_all_formats_with_output_strips_ext(self, tmp_path):
-        config = self._make_config(output="report.md")  # format=None
-        mock_data = {
-            "user_real_name": "",
-            "total_commits_default_branch": 0,
-            "total_commits_all": 0,
-            "total_prs": 0,
-            "total_pr_reviews": 0,
-            "total_issues": 0,
-            "total_additions": 0,
-            "total_deletions": 0,
-            "test_commits": 0,
-            "repos_contributed": 0,
-            "reviews_received": 0,
-            "pr_comments_received": 0,
-            "repos_by_category": {},
-            "repo_line_stats": {},
-            "repo_languages": {},
-            "prs_nodes": [],
-            "reviewed_nodes": [],
-        }
-        md_report = "# report"
+        mod.run(config, write_text=run_mocks.write_text)
 
-        with (
-            patch.object(mod, "gather_user_data", return_value=mock_data),
-            patch.object(mod, "generate_report", return_value=md_report),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
-
-        assert mock_write.call_count == 3
-
-    def test_user_mode_all_formats_unrecognized_ext_uses_as_stem(self):
-        config = self._make_config(output="report.txt")  # format=None
-        mock_data = {
-            "user_real_name": "",
-            "total_commits_default_branch": 0,
-            "total_commits_all": 0,
-            "total_prs": 0,
-            "total_pr_reviews": 0,
-            "total_issues": 0,
-            "total_additions": 0,
-            "total_deletions": 0,
-            "test_commits": 0,
-            "repos_contributed": 0,
-            "reviews_received": 0,
-            "pr_comments_received": 0,
-            "repos_by_category": {},
-            "repo_line_stats": {},
-            "repo_languages": {},
-            "prs_nodes": [],
-            "reviewed_nodes": [],
-        }
-        md_report = "# report"
+        assert [str(p) for p, _ in run_mocks.writes] == [
+            "alice-2026-01-01-to-2026-01-07.md",
+            "alice-2026-01-01-to-2026-01-07.json",
+            "alice-2026-01-01-to-2026-01-07.html",
+        ]
 
-        with (
-            patch.object(mod, "gather_user_data", return_value=mock_data),
-            patch.object(mod, "generate_report", return_value=md_report),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
+    def test_user_mode_all_formats_with_output_strips_ext(self, run_mocks):
+        config = _RUN_CONFIG._replace(output="report.md")  # format=None
+        run_mocks.generate_report.return_value = "# report"
 
-        # Stem is "report.txt" (unrecognized ext kept as-is)
-        assert mock_write.call_count == 3
-
-    def test_org_mode_all_formats_writes_three_files(self):
-        config = self._make_config(username=None, org="myorg")  # format=None
-        report_md = "# org report"
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {},
-            [],
-        )
+        mod.run(config, write_text=run_mocks.write_text)
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
+        assert [str(p) for p, _ in run_mocks.writes] == [
+            "report.md",
+            "report.json",
+            "report.html",
+        ]
+
+    def test_user_mode_all_formats_unrecognized_ext_uses_as_stem(
+        self, run_mocks
+    ):
+        config = _RUN_CONFIG._replace(output="report.txt")  # format=None
+        run_mocks.generate_report.return_value = "# report"
+
+        mod.run(config, write_text=run_mocks.write_text)
+
+        # Stem is "report.txt" (unrecognized ext kept as-is)
+        assert [str(p) for p, _ in run_mocks.writes] == [
+            "report.txt.md",
+            "report.txt.json",
+            "report.txt.html",
+        ]
+
+    def test_org_mode_all_formats_writes_three_files(self, run_mocks):
+        config = _ORG_CONFIG  # format=None
+
+        mod.run(config, write_text=run_mocks.write_text)
+
+        assert [str(p) for p, _ in run_mocks.writes] == [
+            "myorg-2026-01-01-to-2026-01-07.md",
+            "myorg-2026-01-01-to-2026-01-07.json",
+            "myorg-2026-01-01-to-2026-01-07.html",
+        ]
+
+    def test_write_report_writes_utf8(self, tmp_path):
+        path = tmp_path / "report.md"
+        report = "# Report \u2014 caf\u00e9\n"
+        mod.write_report(path, report)
+        assert path.read_bytes() == report.encode("utf-8")
+
+    @pytest.mark.parametrize(
+        "overrides,expected",
+        [
+            # --private adds '-private' to default output stem
+            pytest.param(
+                dict(private=True),
+                "myorg-private-2026-01-01-to-2026-01-07",
+                id="private_flag_adds_private_to_stem",
             ),
-            patch.object(
-                mod,
-                "generate_org_report",
-                return_value=report_md,
+            pytest.param(
+                dict(private=False),
+                "myorg-2026-01-01-to-2026-01-07",
+                id="no_private_flag_no_private_in_stem",
             ),
-            patch.object(mod, "progress"),
-            patch.object(Path, "write_text") as mock_write,
-        ):
-            mod.run(config)
-
-        assert mock_write.call_count == 3
-
-    def test_private_flag_adds_private_to_stem(self):
-        """--private adds '-private' to default output stem."""
-        config = self._make_config(username=None, org="myorg", private=True)
-        stem = mod._resolve_stem(config)
-        assert "-private-" in stem
-        assert stem.startswith("myorg-private-")
-
-    def test_no_private_flag_no_private_in_stem(self):
-        """Without --private, stem doesn't contain '-private'."""
-        config = self._make_config(username=None, org="myorg", private=False)
-        stem = mod._resolve_stem(config)
-        assert "-private" not in stem
-
-    def test_private_with_team_in_stem(self):
-        """--private with --team includes both in stem."""
-        config = self._make_config(
-            username=None, org="myorg", team="coreteam", private=True
-        )
-        stem = mod._resolve_stem(config)
-        assert "myorg-coreteam-private-" in stem
-
-    def test_private_with_explicit_output_ignores_flag(self):
-        """--output overrides default stem; --private doesn't affect it."""
-        config = self._make_config(
-            username=None, org="myorg", private=True, output="custom"
-        )
-        stem = mod._resolve_stem(config)
-        assert stem == "custom"
+            pytest.param(
+                dict(team="coreteam", private=True),
+                "myorg-coreteam-private-2026-01-01-to-2026-01-07",
+                id="private_with_team_in_stem",
+            ),
+            # --output overrides default stem; --private doesn't affect it
+            pytest.param(
+                dict(private=True, output="custom"),
+                "custom",
+                id="private_with_explicit_output_ignores_flag",
+            ),
+        ],
+    )
+    def test_org_stem(self, overrides, expected):
+        config = _ORG_CONFIG._replace(**overrides)
+        assert mod._resolve_stem(config) == expected
 
-    def test_user_mode_all_formats_gathers_data_once(self):
+    def test_user_mode_all_formats_gathers_data_once(self, run_mocks):
         """gather_user_data called once in all-formats mode."""
-        config = self._make_config()  # format=None
-        mock_data = {
-            "user_real_name": "",
-            "total_commits_default_branch": 0,
-            "total_commits_all": 0,
-            "total_prs": 0,
-            "total_pr_reviews": 0,
-            "total_issues": 0,
-            "total_additions": 0,
-            "total_deletions": 0,
-            "test_commits": 0,
-            "repos_contributed": 0,
-            "reviews_received": 0,
-            "pr_comments_received": 0,
-            "repos_by_category": {},
-            "repo_line_stats": {},
-            "repo_languages": {},
-            "prs_nodes": [],
-            "reviewed_nodes": [],
-        }
-        md_report = "# report"
+        config = _RUN_CONFIG  # format=None
 
-        with (
-            patch.object(
-                mod, "gather_user_data", return_value=mock_data
-            ) as mock_gather,
-            patch.object(mod, "generate_report", return_value=md_report),
-            patch.object(Path, "write_text"),
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        mock_gather.assert_called_once()
+        assert run_mocks.gather_user_data.calls == 1
 
-    def test_org_all_formats_shows_progress_for_each_step(self):
+    def test_org_all_formats_shows_progress_for_each_step(self, run_mocks):
         """All-formats org mode shows progress for HTML and JSON."""
-        config = self._make_config(username=None, org="myorg")
-        report_md = "# org report"
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {},
-            [],
-        )
+        config = _ORG_CONFIG
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-            patch.object(
-                mod,
-                "generate_org_report",
-                return_value=report_md,
-            ),
-            patch.object(mod, "progress") as mock_progress,
-            patch.object(Path, "write_text"),
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        calls = [str(c) for c in mock_progress.method_calls]
-        assert "call.start('Writing HTML...')" in calls
-        assert "call.update('Writing JSON...')" in calls
-        assert "call.stop()" in calls
+        progress = run_mocks.progress
+        progress.start.assert_any_call("Writing HTML...")
+        progress.update.assert_any_call("Writing JSON...")
+        progress.stop.assert_called()
 
-    def test_org_json_only_shows_progress(self):
+    def test_org_json_only_shows_progress(self, run_mocks):
         """JSON-only org mode shows progress for JSON."""
-        config = self._make_config(username=None, org="myorg", format="json")
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {
-                "repos_by_category": {},
-                "prs_nodes": [],
-                "reviewed_nodes": [],
-            },
-            [],
-        )
+        config = _ORG_CONFIG._replace(format="json")
+        gather = run_mocks.gather_org_data_active_contributors
+        gather.return_value = _org_gather_result(_EMPTY_AGGREGATED)
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-            patch.object(mod, "progress") as mock_progress,
-            patch.object(Path, "write_text"),
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        calls = [str(c) for c in mock_progress.method_calls]
-        assert "call.start('Writing JSON...')" in calls
-        assert "call.stop()" in calls
+        progress = run_mocks.progress
+        progress.start.assert_any_call("Writing JSON...")
+        progress.stop.assert_called()
 
-    def test_org_html_only_shows_progress(self):
+    def test_org_html_only_shows_progress(self, run_mocks):
         """HTML-only org mode shows progress for HTML."""
-        config = self._make_config(username=None, org="myorg", format="html")
-        report_md = "# org report"
-        gather_result = (
-            {"login": "myorg"},
-            None,
-            [],
-            {},
-            [],
-        )
+        config = _ORG_CONFIG._replace(format="html")
 
-        with (
-            patch.object(
-                mod,
-                "gather_org_data_active_contributors",
-                return_value=gather_result,
-            ),
-            patch.object(
-                mod,
-                "generate_org_report",
-                return_value=report_md,
-            ),
-            patch.object(mod, "progress") as mock_progress,
-            patch.object(Path, "write_text"),
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        calls = [str(c) for c in mock_progress.method_calls]
-        assert "call.start('Writing HTML...')" in calls
-        assert "call.stop()" in calls
+        progress = run_mocks.progress
+        progress.start.assert_any_call("Writing HTML...")
+        progress.stop.assert_called()
 
-    def test_user_all_formats_shows_progress_for_each_step(self):
+    def test_user_all_formats_shows_progress_for_each_step(self, run_mocks):
         """All-formats user mode shows progress for HTML and JSON."""
-        config = self._make_config()  # format=None
-        mock_data = {
-            "user_real_name": "",
-            "total_commits_default_branch": 0,
-            "total_commits_all": 0,
-            "total_prs": 0,
-            "total_pr_reviews": 0,
-            "total_issues": 0,
-            "total_additions": 0,
-            "total_deletions": 0,
-            "test_commits": 0,
-            "repos_contributed": 0,
-            "reviews_received": 0,
-            "pr_comments_received": 0,
-            "repos_by_category": {},
-            "repo_line_stats": {},
-            "repo_languages": {},
-            "prs_nodes": [],
-            "reviewed_nodes": [],
-        }
-        md_report = "# report"
+        config = _RUN_CONFIG  # format=None
 
-        with (
-            patch.object(mod, "gather_user_data", return_value=mock_data),
-            patch.object(mod, "generate_report", return_value=md_report),
-            patch.object(mod, "progress") as mock_progress,
-            patch.object(Path, "write_text"),
-        ):
-            mod.run(config)
+        mod.run(config, write_text=run_mocks.write_text)
 
-        calls = [str(c) for c in mock_progress.method_calls]
-        assert "call.start('Writing HTML...')" in calls
-        assert "call.update('Writing JSON...')" in calls
-        assert "call.stop()" in calls
+        progress = run_mocks.progress
+        progress.start.assert_any_call("Writing HTML...")
+        progress.update.assert_any_call("Writing JSON...")
+        progress.stop.assert_called()
 
 
 # -----------------------------------------------------------------------
@@ -919,127 +644,146 @@ class TestRun:
 class TestMain:
     """Tests for main() username auto-detection paths."""
 
-    def _no_user_config(self):
-        return mod.RunConfig(
-            username=None,
-            org=None,
-            team=None,
-            owners=False,
-            private=False,
-            since_date="2026-01-01",
-            until_date="2026-01-07",
-            output=None,
-            stdout=False,
-            yes=False,
-            format=None,
-            notable_prs=15,
+    @pytest.fixture(autouse=True)
+    def fresh_username_cache(self):
+        """Keep one test's detected username out of the next."""
+        mod.detect_gh_username.cache_clear()
+        yield
+        mod.detect_gh_username.cache_clear()
+
+    @pytest.fixture
+    def run_configs(self, monkeypatch):
+        """Feed main() a no-user config; collect what it passes to run()."""
+        configs = []
+        monkeypatch.setattr(mod, "run", configs.append)
+        monkeypatch.setattr(
+            mod, "parse_and_validate_args", self._no_user_config
         )
+        return configs
 
-    def test_username_detected_successfully(self):
+    def _no_user_config(self):
+        return _RUN_CONFIG._replace(username=None)
+
+    def _gh_output(self, stdout):
+        """A successful gh run that printed stdout."""
+        return subprocess.CompletedProcess([], 0, stdout=stdout)
+
+    def _gh_error(self, stderr):
+        error = subprocess.CalledProcessError(1, "gh")
+        error.stderr = stderr
+        return error
+
+    def test_username_detected_successfully(self, run_configs):
         """gh api user succeeds → username populated, run() called."""
-        mock_result = MagicMock()
-        mock_result.stdout = "alice\n"
+        with patch("subprocess.run", return_value=self._gh_output("alice\n")):
+            mod.main()
 
-        with (
-            patch.object(
-                mod,
-                "parse_and_validate_args",
-                return_value=self._no_user_config(),
-            ),
-            patch("subprocess.run", return_value=mock_result),
-            patch.object(mod, "run") as mock_run,
-        ):
+        assert [c.username for c in run_configs] == ["alice"]
+
+    def test_detected_username_is_cached(self, run_configs):
+        """A second main() in the same process reuses the detected login."""
+        result = self._gh_output("alice\n")
+        with patch("subprocess.run", return_value=result) as mock_sp:
+            mod.main()
             mod.main()
 
-        called_config = mock_run.call_args[0][0]
-        assert called_config.username == "alice"
+        mock_sp.assert_called_once()
+        assert [c.username for c in run_configs] == ["alice", "alice"]
 
-    def test_username_empty_raises_value_error(self):
+    def test_username_empty_raises_value_error(self, run_configs):
         """gh api user returns empty string → SystemExit(1)."""
-        mock_result = MagicMock()
-        mock_result.stdout = "   \n"
-
         with (
-            patch.object(
-                mod,
-                "parse_and_validate_args",
-                return_value=self._no_user_config(),
-            ),
-            patch("subprocess.run", return_value=mock_result),
+            patch("subprocess.run", return_value=self._gh_output("   \n")),
             pytest.raises(SystemExit) as exc_info,
         ):
             mod.main()
 
         assert exc_info.value.code == 1
+        assert run_configs == []
 
-    def test_subprocess_error_generic(self):
+    def test_subprocess_error_generic(self, run_configs):
         """gh api user fails (non-rate-limit) → SystemExit(1)."""
-        error = subprocess.CalledProcessError(1, "gh")
-        error.stderr = "some error"
-
         with (
-            patch.object(
-                mod,
-                "parse_and_validate_args",
-                return_value=self._no_user_config(),
-            ),
-            patch("subprocess.run", side_effect=error),
+            patch("subprocess.run", side_effect=self._gh_error("some error")),
             pytest.raises(SystemExit) as exc_info,
         ):
             mod.main()
 
         assert exc_info.value.code == 1
 
-    def test_subprocess_error_rate_limit(self):
+    def test_subprocess_error_rate_limit(self, run_configs, monkeypatch):
         """gh api user fails with rate limit → calls print_rate_limit_error."""
-        error = subprocess.CalledProcessError(1, "gh")
-        error.stderr = "API rate limit exceeded"
+        waits = _Stub(False)
+        rate_limit_errors = _Stub()
+        monkeypatch.setattr(mod, "wait_for_rate_limit_reset", waits)
+        monkeypatch.setattr(mod, "print_rate_limit_error", rate_limit_errors)
+        error = self._gh_error("API rate limit exceeded")
 
         with (
-            patch.object(
-                mod,
-                "parse_and_validate_args",
-                return_value=self._no_user_config(),
-            ),
             patch("subprocess.run", side_effect=error),
-            patch.object(mod, "print_rate_limit_error") as mock_rle,
             pytest.raises(SystemExit),
         ):
             mod.main()
 
-        mock_rle.assert_called_once()
+        assert waits.calls == 1
+        assert rate_limit_errors.calls == 1
+
+    def test_subprocess_error_rate_limit_waits_and_retries(
+        self, run_configs, monkeypatch
+    ):
+        """Rate-limited gh api user is retried after the limit resets."""
+        waits = _Stub(True)
+        monkeypatch.setattr(mod, "wait_for_rate_limit_reset", waits)
+        results = [
+            self._gh_error("API rate limit exceeded"),
+            self._gh_output("alice\n"),
+        ]
+
+        with patch("subprocess.run", side_effect=results):
+            mod.main()
+
+        assert waits.calls == 1
+        assert [c.username for c in run_configs] == ["alice"]
+
+    def test_subprocess_error_rate_limit_gives_up(
+        self, run_configs, monkeypatch
+    ):
+        """Still rate-limited after the last attempt → SystemExit(1)."""
+        waits = _Stub(True)
+        rate_limit_errors = _Stub()
+        monkeypatch.setattr(mod, "wait_for_rate_limit_reset", waits)
+        monkeypatch.setattr(mod, "print_rate_limit_error", rate_limit_errors)
+        error = self._gh_error("API rate limit exceeded")
+        attempts = mod.USERNAME_DETECT_ATTEMPTS
 
-    def test_org_mode_skips_detection(self):
-        """Org mode does not attempt username detection."""
-        config = self._no_user_config()._replace(org="myorg")
         with (
-            patch.object(
-                mod,
-                "parse_and_validate_args",
-                return_value=config,
-            ),
-            patch.object(mod, "run") as mock_run,
-            patch("subprocess.run") as mock_sp,
+            patch("subprocess.run", side_effect=error) as mock_sp,
+            pytest.raises(SystemExit),
         ):
             mod.main()
 
+        assert mock_sp.call_count == attempts
+        assert waits.calls == attempts - 1
+        assert rate_limit_errors.calls == 1
+
+    def test_org_mode_skips_detection(self, run_configs, monkeypatch):
+        """Org mode does not attempt username detection."""
+        config = self._no_user_config()._replace(org="myorg")
+        monkeypatch.setattr(mod, "parse_and_validate_args", lambda: config)
+
+        with patch("subprocess.run") as mock_sp:
+            mod.main()
+
         mock_sp.assert_not_called()
-        mock_run.assert_called_once()
+        assert run_configs == [config]
 
-    def test_explicit_user_skips_detection(self):
+    def test_explicit_user_skips_detection(self, run_configs, monkeypatch):
         """--user provided skips subprocess detection."""
         config = self._no_user_config()._replace(username="bob")
-        with (
-            patch.object(
-                mod,
-                "parse_and_validate_args",
-                return_value=config,
-            ),
-            patch.object(mod, "run") as mock_run,
-            patch("subprocess.run") as mock_sp,
-        ):
+        monkeypatch.setattr(mod, "parse_and_validate_args", lambda: config)
+
+        with patch("subprocess.run") as mock_sp:
             mod.main()
 
         mock_sp.assert_not_called()
-        called_config = mock_run.call_args[0][0]
-        assert called_config.username == "bob"
+        assert [c.username for c in run_configs] == ["bob"]
@@ -8,27 +8,58 @@ The recorded fixtures capture real GitHub API responses, ensuring
 tests exercise actual data structures and edge cases.
 """
 
-import sys
+import re
+from collections import namedtuple
+from contextlib import ExitStack
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, List
 from unittest.mock import patch
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from tests.conftest import load_chronicle_module  # noqa: E402
-from tests.api_recorder import create_mock_responses_for_user  # noqa: E402
+from tests.conftest import load_chronicle_module
+from tests.api_recorder import create_mock_responses_for_user
 
 mod = load_chronicle_module()
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 API_RESPONSES_DIR = FIXTURES_DIR / "api_responses"
 
+# The "Commit details by ..." headings of an org report
+DETAIL_SECTION_PATTERN = re.compile(
+    r"Commit details by (language|repository|user|organization)"
+)
+
+
+def deep_freeze(value):
+    """Return a read-only view of a JSON-like value.
+
+    Dicts become MappingProxyType views and lists become tuples, all
+    the way down, so a shared fixture can't be mutated by the code
+    under test.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: deep_freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(deep_freeze(v) for v in value)
+    return value
+
+
+# One recorded MockGhCommand call
+GhCall = namedtuple("GhCall", ["args", "parse_json", "kwargs"])
+
 
 class MockGhCommand:
     """Mock for run_gh_command that returns pre-defined responses."""
 
+    __slots__ = ("responses", "call_log", "_dispatch")
+
+    # Fixed REST responses, shared by every call rather than rebuilt
+    _COMMIT_STATS = deep_freeze({"stats": {"additions": 10, "deletions": 5}})
+    _LANGUAGES = deep_freeze({"Python": 10000, "JavaScript": 5000})
+    _RATE_LIMIT = deep_freeze({"resources": {"graphql": {"remaining": 5000}}})
+
     def __init__(self, responses: Dict[str, Any]):
         """Initialize with a dict of call patterns to responses.
 
@@ -41,24 +72,23 @@ class MockGhCommand:
             - "repo_info": repo info response
         """
         self.responses = responses
-        self.call_log: List[Dict] = []
+        self.call_log: List[GhCall] = []
+        # Response for each distinct call, resolved on first use
+        self._dispatch: Dict[tuple, Any] = {}
 
     def __call__(self, args: List[str], parse_json: bool = True, **kwargs):
         """Handle a mocked gh command call."""
-        call_record = {
-            "args": args,
-            "parse_json": parse_json,
-            "kwargs": kwargs,
-        }
-        self.call_log.append(call_record)
-
-        # Convert args to string for pattern matching
-        args_str = " ".join(str(a) for a in args)
+        self.call_log.append(GhCall(args, parse_json, kwargs))
 
-        # Check for --jq flag (returns raw string, not JSON)
-        has_jq = "--jq" in args
+        # The same calls repeat across users and pages, so only the first
+        # of each walks the pattern checks in _resolve()
+        key = (tuple(args), parse_json)
+        if key not in self._dispatch:
+            self._dispatch[key] = self._resolve(args, parse_json)
+        return self._dispatch[key]
 
-        # Determine response based on args
+    def _resolve(self, args: List[str], parse_json: bool):
+        """Pick the response for a gh call by matching its args."""
         if "graphql" in args:
             # GraphQL query - look at the query content
             query_idx = args.index("-f") + 1 if "-f" in args else -1
@@ -89,23 +119,24 @@ class MockGhCommand:
                     )
 
         elif "api" in args:
-            # REST API call
+            # REST API call; only these need the args as one string
+            args_str = " ".join(str(a) for a in args)
             if "search/commits" in args_str:
                 # Check if this is using --jq to get just the count
-                if has_jq and ".total_count" in args_str:
+                if "--jq" in args and ".total_count" in args_str:
                     return "0"  # Return string for --jq output
                 return self.responses.get(
                     "search_commits", {"total_count": 0, "items": []}
                 )
             elif "/repos/" in args_str and "/commits/" in args_str:
                 # Commit stats
-                return {"stats": {"additions": 10, "deletions": 5}}
+                return self._COMMIT_STATS
             elif "user/repos" in args_str or "repositories" in args_str:
                 return self.responses.get("user_forks", [])
             elif "/languages" in args_str:
-                return {"Python": 10000, "JavaScript": 5000}
+                return self._LANGUAGES
             elif "rate_limit" in args_str:
-                return {"resources": {"graphql": {"remaining": 5000}}}
+                return self._RATE_LIMIT
 
         # Default empty response
         return {} if parse_json else ""
@@ -114,14 +145,18 @@ class MockGhCommand:
 class TestE2EUserReport:
     """End-to-end tests for user report generation."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_responses(self):
-        """Create mock responses for a user report."""
-        return create_mock_responses_for_user("testuser", days=7)
+        """Create mock responses for a user report.
 
-    @pytest.fixture
-    def mock_gh(self, mock_responses):
-        """Create a MockGhCommand with the responses."""
+        Built once for the class and frozen, so any attempt by the code
+        under test to mutate the shared responses fails loudly.
+        """
+        return deep_freeze(create_mock_responses_for_user("testuser", days=7))
+
+    @pytest.fixture(scope="class")
+    def shared_mock_gh(self, mock_responses):
+        """Create a MockGhCommand with the responses, once per class."""
         return MockGhCommand(
             {
                 "graphql_contributions": mock_responses[
@@ -145,6 +180,12 @@ class TestE2EUserReport:
             }
         )
 
+    @pytest.fixture
+    def mock_gh(self, shared_mock_gh):
+        """The shared MockGhCommand, with a call log fresh for each test."""
+        shared_mock_gh.call_log.clear()
+        return shared_mock_gh
+
     def test_full_user_data_gathering(self, mock_gh):
         """Test complete user data gathering with mocked API."""
         with patch.object(mod, "run_gh_command", mock_gh):
@@ -192,15 +233,15 @@ class TestE2EUserReport:
         expected_commits = collection["totalCommitContributions"]
 
         # Report should mention commit count somewhere
-        assert str(expected_commits) in report or "commits" in report.lower()
+        assert re.search(rf"{expected_commits}|commits", report, re.IGNORECASE)
 
 
 class TestE2EOrgReport:
     """End-to-end tests for org report generation."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_member_data(self):
-        """Create mock member data list."""
+        """Create mock member data list (read-only, shared by the class)."""
         return [
             {
                 "username": "member1",
@@ -265,10 +306,22 @@ class TestE2EOrgReport:
             },
         ]
 
-    def test_org_data_aggregation(self, mock_member_data):
-        """Test org data is properly aggregated from member data."""
-        aggregated = mod.aggregate_org_data(mock_member_data)
+    @pytest.fixture(scope="class")
+    def aggregated(self, mock_member_data):
+        """aggregate_org_data() over the mock members, computed once."""
+        return mod.aggregate_org_data(mock_member_data)
 
+    @pytest.fixture(scope="class")
+    def report(self, mock_member_data, aggregated):
+        """The org report for the mock members, generated once."""
+        org_info = {"login": "testorg", "name": "Test Organization"}
+        members = [{"login": m["username"]} for m in mock_member_data]
+        return mod.generate_org_report(
+            org_info, None, "2026-01-01", "2026-01-07", aggregated, members
+        )
+
+    def test_org_data_aggregation(self, aggregated):
+        """Test org data is properly aggregated from member data."""
         # Check aggregation
         assert aggregated["total_commits_default_branch"] == 50  # 30 + 20
         assert aggregated["total_prs"] == 8  # 5 + 3
@@ -282,53 +335,60 @@ class TestE2EOrgReport:
         assert "member1" in repo1_commits
         assert "member2" in repo1_commits
 
-    def test_full_org_report_generation(self, mock_member_data):
+    @pytest.mark.parametrize(
+        "needle",
+        [
+            "# github activity chronicle",
+            "testorg",
+            "<details",  # Has collapsible sections
+            'name="activity"',  # Accordion behavior
+        ],
+    )
+    def test_full_org_report_generation(self, report, needle):
         """Test complete org report generation."""
-        org_info = {"login": "testorg", "name": "Test Organization"}
-        members = [{"login": m["username"]} for m in mock_member_data]
-
-        aggregated = mod.aggregate_org_data(mock_member_data)
-        report = mod.generate_org_report(
-            org_info, None, "2026-01-01", "2026-01-07", aggregated, members
-        )
+        assert needle in report
 
-        # Verify report structure
-        assert "# github activity chronicle" in report
-        assert "testorg" in report
-        assert "<details" in report  # Has collapsible sections
-        assert 'name="activity"' in report  # Accordion behavior
-
-    def test_org_report_has_all_detail_sections(self, mock_member_data):
+    def test_org_report_has_all_detail_sections(self, report):
         """Verify org report has all four detail sections."""
-        org_info = {"login": "testorg", "name": "Test Organization"}
-        members = [{"login": m["username"]} for m in mock_member_data]
-
-        aggregated = mod.aggregate_org_data(mock_member_data)
-        report = mod.generate_org_report(
-            org_info, None, "2026-01-01", "2026-01-07", aggregated, members
-        )
-
-        assert "Commit details by language" in report
-        assert "Commit details by repository" in report
-        assert "Commit details by user" in report
-        assert "Commit details by organization" in report
+        # One scan for all four headings; a failure shows which are missing
+        found = set(DETAIL_SECTION_PATTERN.findall(report))
+        assert found >= {"language", "repository", "user", "organization"}
 
-    def test_org_report_member_grouping(self, mock_member_data):
+    def test_org_report_member_grouping(self, report):
         """Verify members are grouped by company correctly."""
-        org_info = {"login": "testorg", "name": "Test Organization"}
-        members = [{"login": m["username"]} for m in mock_member_data]
-
-        aggregated = mod.aggregate_org_data(mock_member_data)
-        report = mod.generate_org_report(
-            org_info, None, "2026-01-01", "2026-01-07", aggregated, members
-        )
-
         # member1 has @testorg, member2 has "Other Corp"
         # Both should appear in their respective groups
-        assert "testorg" in report.lower()
+        assert re.search("testorg", report, re.IGNORECASE)
         # The report should have organization groupings
 
 
+# Zero-activity light-mode member; _member() overrides what a test needs
+_DEFAULT_MEMBER = MappingProxyType(
+    {
+        "username": "",
+        "user_real_name": "",
+        "company": "",
+        "total_commits_default_branch": 0,
+        "total_commits_all": 0,
+        "total_prs": 0,
+        "total_pr_reviews": 0,
+        "total_issues": 0,
+        "total_additions": 0,
+        "total_deletions": 0,
+        "repos_contributed": 0,
+        "repos_by_category": {},
+        "prs_nodes": [],
+        "reviewed_nodes": [],
+        "is_light_mode": True,
+    }
+)
+
+
+def _member(**overrides):
+    """Build a member data dict from _DEFAULT_MEMBER plus overrides."""
+    return {**_DEFAULT_MEMBER, **overrides}
+
+
 class TestE2EDataFlow:
     """Tests verifying data flows correctly through the system."""
 
@@ -336,19 +396,13 @@ class TestE2EDataFlow:
         """Verify commit counts are consistent throughout data flow."""
         # Create member data with known commit counts
         member_data = [
-            {
-                "username": "user1",
-                "user_real_name": "User One",
-                "company": "",
-                "total_commits_default_branch": 100,
-                "total_commits_all": 100,
-                "total_prs": 0,
-                "total_pr_reviews": 0,
-                "total_issues": 0,
-                "total_additions": 0,
-                "total_deletions": 0,
-                "repos_contributed": 1,
-                "repos_by_category": {
+            _member(
+                username="user1",
+                user_real_name="User One",
+                total_commits_default_branch=100,
+                total_commits_all=100,
+                repos_contributed=1,
+                repos_by_category={
                     "Other": [
                         {
                             "name": "org/repo",
@@ -359,10 +413,7 @@ class TestE2EDataFlow:
                         }
                     ]
                 },
-                "prs_nodes": [],
-                "reviewed_nodes": [],
-                "is_light_mode": True,
-            }
+            )
         ]
 
         aggregated = mod.aggregate_org_data(member_data)
@@ -374,60 +425,27 @@ class TestE2EDataFlow:
     def test_pr_deduplication_in_aggregation(self):
         """Verify PRs are deduplicated when aggregating org data."""
         # Two members reviewed the same PR
-        shared_pr_url = "https://github.com/org/repo/pull/1"
+        shared_pr = {
+            "url": "https://github.com/org/repo/pull/1",
+            "title": "Test PR",
+            "additions": 50,
+            "deletions": 10,
+            "author": {"login": "author"},
+            "repository": {"nameWithOwner": "org/repo"},
+        }
         member_data = [
-            {
-                "username": "user1",
-                "user_real_name": "User One",
-                "company": "",
-                "total_commits_default_branch": 0,
-                "total_commits_all": 0,
-                "total_prs": 0,
-                "total_pr_reviews": 1,
-                "total_issues": 0,
-                "total_additions": 0,
-                "total_deletions": 0,
-                "repos_contributed": 0,
-                "repos_by_category": {},
-                "prs_nodes": [],
-                "reviewed_nodes": [
-                    {
-                        "url": shared_pr_url,
-                        "title": "Test PR",
-                        "additions": 50,
-                        "deletions": 10,
-                        "author": {"login": "author"},
-                        "repository": {"nameWithOwner": "org/repo"},
-                    }
-                ],
-                "is_light_mode": True,
-            },
-            {
-                "username": "user2",
-                "user_real_name": "User Two",
-                "company": "",
-                "total_commits_default_branch": 0,
-                "total_commits_all": 0,
-                "total_prs": 0,
-                "total_pr_reviews": 1,
-                "total_issues": 0,
-                "total_additions": 0,
-                "total_deletions": 0,
-                "repos_contributed": 0,
-                "repos_by_category": {},
-                "prs_nodes": [],
-                "reviewed_nodes": [
-                    {
-                        "url": shared_pr_url,
-                        "title": "Test PR",
-                        "additions": 50,
-                        "deletions": 10,
-                        "author": {"login": "author"},
-                        "repository": {"nameWithOwner": "org/repo"},
-                    }
-                ],
-                "is_light_mode": True,
-            },
+            _member(
+                username="user1",
+                user_real_name="User One",
+                total_pr_reviews=1,
+                reviewed_nodes=[shared_pr],
+            ),
+            _member(
+                username="user2",
+                user_real_name="User Two",
+                total_pr_reviews=1,
+                reviewed_nodes=[shared_pr],
+            ),
         ]
 
         aggregated = mod.aggregate_org_data(member_data)
@@ -514,33 +532,25 @@ def _patch_gather(overrides=None):
     return defaults
 
 
+def _gather_with_mocks(mocks, username="testuser", show_progress=False):
+    """Call gather_user_data with each name in mocks patched to return it."""
+    with ExitStack() as stack:
+        for name, retval in mocks.items():
+            stack.enter_context(patch.object(mod, name, return_value=retval))
+        return mod.gather_user_data(
+            username,
+            "2026-01-01",
+            "2026-01-07",
+            show_progress=show_progress,
+        )
+
+
 class TestGatherUserDataBranches:
     """Tests exercising specific branches inside gather_user_data()."""
 
     def _call(self, mocks, username="testuser"):
         """Call gather_user_data with all API functions mocked."""
-        patches = {}
-        for name, retval in mocks.items():
-            patches[name] = patch.object(
-                mod,
-                name,
-                return_value=retval,
-            )
-
-        ctx = {}
-        for name, p in patches.items():
-            ctx[name] = p.start()
-
-        try:
-            return mod.gather_user_data(
-                username,
-                "2026-01-01",
-                "2026-01-07",
-                show_progress=False,
-            )
-        finally:
-            for p in patches.values():
-                p.stop()
+        return _gather_with_mocks(mocks, username)
 
     # 1. get_all_commits returns None
     def test_commits_data_none(self):
@@ -1125,32 +1135,9 @@ class TestGatherUserDataWithProgress:
 
     def _call_with_progress(self, mocks, username="testuser"):
         """Call gather_user_data with show_progress=True."""
-        patches = {}
-        for name, retval in mocks.items():
-            patches[name] = patch.object(
-                mod,
-                name,
-                return_value=retval,
-            )
-
-        for p in patches.values():
-            p.start()
-
         # Also mock progress so it doesn't write to stderr
-        progress_patch = patch.object(mod, "progress")
-        progress_patch.start()
-
-        try:
-            return mod.gather_user_data(
-                username,
-                "2026-01-01",
-                "2026-01-07",
-                show_progress=True,
-            )
-        finally:
-            progress_patch.stop()
-            for p in patches.values():
-                p.stop()
+        with patch.object(mod, "progress"):
+            return _gather_with_mocks(mocks, username, show_progress=True)
 
     def test_progress_branches_covered(self):
         """Calling with show_progress=True covers progress.start/update."""
@@ -1209,25 +1196,7 @@ class TestGatherUserDataForkMissingFields:
     """Test fork with missing full_name or parent_name is skipped."""
 
     def _call(self, mocks, username="testuser"):
-        patches = {}
-        for name, retval in mocks.items():
-            patches[name] = patch.object(
-                mod,
-                name,
-                return_value=retval,
-            )
-        for p in patches.values():
-            p.start()
-        try:
-            return mod.gather_user_data(
-                username,
-                "2026-01-01",
-                "2026-01-07",
-                show_progress=False,
-            )
-        finally:
-            for p in patches.values():
-                p.stop()
+        return _gather_with_mocks(mocks, username)
 
     def test_fork_missing_parent_skipped(self):
         """Fork entry without parent.full_name is skipped."""
@@ -1261,25 +1230,7 @@ class TestGatherUserDataPrivateRepoSkipped:
     """Test that private repos are skipped during commit aggregation."""
 
     def _call(self, mocks, username="testuser"):
-        patches = {}
-        for name, retval in mocks.items():
-            patches[name] = patch.object(
-                mod,
-                name,
-                return_value=retval,
-            )
-        for p in patches.values():
-            p.start()
-        try:
-            return mod.gather_user_data(
-                username,
-                "2026-01-01",
-                "2026-01-07",
-                show_progress=False,
-            )
-        finally:
-            for p in patches.values():
-                p.stop()
+        return _gather_with_mocks(mocks, username)
 
     def test_private_repo_skipped_via_repo_info(self):
         """Repo not flagged private in commit data but private in repo_info.
@@ -1,11 +1,6 @@
 """Tests for markdown_to_html() and _inline_markdown() converters."""
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from tests.conftest import load_chronicle_module  # noqa: E402
+from tests.conftest import load_chronicle_module
 
 mod = load_chronicle_module()
 
@@ -2814,19 +2814,19 @@ class TestPromptRateLimitWarning:
 
     def test_user_confirms(self, mod):
         """User types 'y' → returns True."""
-        with patch("builtins.input", return_value="y"):
+        with patch.object(mod, "_confirm", return_value="y"):
             result = mod.prompt_rate_limit_warning("many calls")
         assert result is True
 
     def test_user_declines(self, mod):
         """User types 'n' → returns False."""
-        with patch("builtins.input", return_value="n"):
+        with patch.object(mod, "_confirm", return_value="n"):
             result = mod.prompt_rate_limit_warning("many calls")
         assert result is False
 
     def test_eof_returns_false(self, mod):
         """EOFError → returns False."""
-        with patch("builtins.input", side_effect=EOFError):
+        with patch.object(mod, "_confirm", side_effect=EOFError):
             result = mod.prompt_rate_limit_warning("many calls")
         assert result is False
 
@@ -2841,7 +2841,7 @@ class TestPromptRateLimitWarning:
                 "get_rate_limit_reset_time",
                 return_value=(reset, "graphql"),
             ),
-            patch("builtins.input", return_value="n"),
+            patch.object(mod, "_confirm", return_value="n"),
         ):
             mod.prompt_rate_limit_warning("many calls")
         stderr = capsys.readouterr().err
@@ -2858,7 +2858,7 @@ class TestPromptRateLimitWarning:
                 "get_rate_limit_reset_time",
                 return_value=(None, None),
             ),
-            patch("builtins.input", return_value="n"),
+            patch.object(mod, "_confirm", return_value="n"),
         ):
             mod.prompt_rate_limit_warning("many calls")
         stderr = capsys.readouterr().err
@@ -2875,7 +2875,7 @@ class TestPromptRateLimitWarning:
                 "get_rate_limit_reset_time",
                 return_value=(reset, "graphql"),
             ),
-            patch("builtins.input", return_value="n"),
+            patch.object(mod, "_confirm", return_value="n"),
         ):
             mod.prompt_rate_limit_warning("many calls")
         stderr = capsys.readouterr().err
@@ -1,5 +1,7 @@
 """Unit tests for rate limit estimation and warning logic."""
 
+import pytest
+
 
 class TestEstimateOrgApiCalls:
     """Tests for estimate_org_api_calls()."""
@@ -166,3 +168,21 @@ class TestRateLimitConstants:
         """Check GITHUB_RATE_LIMIT_TOTAL constant."""
         if hasattr(mod, "GITHUB_RATE_LIMIT_TOTAL"):
             assert mod.GITHUB_RATE_LIMIT_TOTAL == 5000
+
+
+class TestIsRateLimitError:
+    """Tests for is_rate_limit_error()."""
+
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("gh: API rate limit exceeded for user ID 1. (HTTP 403)", True),
+            ("You have exceeded a secondary rate limit", True),
+            ("Rate-Limit reached", True),
+            ("HTTP 502: Bad Gateway", False),
+            ("", False),
+            (None, False),
+        ],
+    )
+    def test_is_rate_limit_error(self, mod, message, expected):
+        assert mod.is_rate_limit_error(message) is expected
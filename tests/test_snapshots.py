@@ -12,16 +12,12 @@ update_golden_files()"
 """
 
 import difflib
-import sys
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from tests.conftest import load_chronicle_module  # noqa: E402
+from tests.conftest import load_chronicle_module
 
 # Load the module
 mod = load_chronicle_module()